@@ -1,7 +1,16 @@
+-- Sum rainfall per city id and day first, then look up the city name for display
+WITH daily_rainfall AS (
+    SELECT
+        city_id,
+        DATE(forecast_time) AS forecast_day,
+        SUM(rainfall_mm) AS total_daily_rainfall
+    FROM weather_forecasts
+    GROUP BY city_id, forecast_day
+)
 SELECT
-    city_name,
-    DATE(forecast_time) AS forecast_day,
-    SUM(rainfall_mm) AS total_daily_rainfall
-FROM weather_forecasts
-GROUP BY city_name, forecast_day
-ORDER BY forecast_day, city_name;
\ No newline at end of file
+    ci.city_name,
+    dr.forecast_day,
+    dr.total_daily_rainfall
+FROM daily_rainfall dr
+JOIN cities ci ON dr.city_id = ci.city_id
+ORDER BY dr.forecast_day, ci.city_name;
@@ -1,21 +1,34 @@
 import os
-import requests
-import pandas as pd
-from dotenv import load_dotenv
+from functools import lru_cache
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
 
 # --- Setup ---
-# This line looks for a .env file in the parent directory of this script
-# and loads the environment variables from it (e.g., OPENWEATHER_API_KEY)
-# Let the library find the .env file automatically
-load_dotenv()
-print(f"Current Directory: {os.getcwd()}")
+# Importing this module has no side effects: the .env file, requests and pandas
+# are only loaded the first time they are needed.
+
+@lru_cache(maxsize=None)
+def load_env():
+    """
+    Looks for a .env file in this script's directory or its parents and loads
+    the environment variables from it (e.g., OPENWEATHER_API_KEY), once.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+
+def get_openweather_api_key():
+    """Returns the OpenWeather API key from the environment or the .env file."""
+    load_env()
+    return os.getenv("OPENWEATHER_API_KEY")
 
 # --- Constants ---
-OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
 OPENWEATHER_API_URL = "https://api.openweathermap.org/data/2.5/forecast"
 FAKE_STORE_API_URL = "https://fakestoreapi.com/products"
 # We will get 50 customers for this demonstration.
 FAKER_API_CUSTOMERS_URL = "https://fakerapi.it/api/v1/persons?_quantity=50"
+# (connect, read) timeouts in seconds, so a hung API cannot block the run forever.
+REQUEST_TIMEOUT = (3.05, 15)
 
 # Latitude and longitude for the target cities, as specified in the project
 CITIES = {
@@ -33,6 +46,8 @@ def fetch_weather_data(api_key, cities):
     Fetches 5-day/3-hour weather forecast for multiple cities from OpenWeather API.
     Returns a list of all forecast entries.
     """
+    import requests
+
     all_forecasts = []
     print("Fetching weather data...")
 
@@ -49,7 +64,7 @@ def fetch_weather_data(api_key, cities):
         }
         
         try:
-            response = requests.get(OPENWEATHER_API_URL, params=params)
+            response = requests.get(OPENWEATHER_API_URL, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             data = response.json()
             
@@ -68,9 +83,11 @@ def fetch_weather_data(api_key, cities):
 
 def fetch_product_data():
     """Fetches product data from the Fake Store API."""
+    import requests
+
     print("Fetching product data...")
     try:
-        response = requests.get(FAKE_STORE_API_URL)
+        response = requests.get(FAKE_STORE_API_URL, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         print("  Successfully fetched product data.")
@@ -81,9 +98,11 @@ def fetch_product_data():
 
 def fetch_customer_data():
     """Fetches mock customer data from FakerAPI."""
+    import requests
+
     print("Fetching customer data...")
     try:
-        response = requests.get(FAKER_API_CUSTOMERS_URL)
+        response = requests.get(FAKER_API_CUSTOMERS_URL, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         data = response.json().get('data', [])
         print("  Successfully fetched customer data.")
@@ -95,7 +114,9 @@ def fetch_customer_data():
 # --- Main Execution Block ---
 # THIS IS THE MOST IMPORTANT PART. IF IT'S MISSING, NOTHING HAPPENS.
 if __name__ == "__main__":
-    weather_data = fetch_weather_data(OPENWEATHER_API_KEY, CITIES)
+    import pandas as pd
+
+    weather_data = fetch_weather_data(get_openweather_api_key(), CITIES)
     product_data = fetch_product_data()
     customer_data = fetch_customer_data()
 
@@ -123,7 +144,7 @@ def load_raw_data(*args, **kwargs):
     This block loads data from the OpenWeather, Fake Store, and Faker APIs.
     """
     # Load the API key from the .env file
-    api_key = os.getenv("OPENWEATHER_API_KEY")
+    api_key = get_openweather_api_key()
 
     # Call the fetching functions you pasted above
     weather_raw = fetch_weather_data(api_key, CITIES)
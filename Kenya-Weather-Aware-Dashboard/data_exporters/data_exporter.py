@@ -1,19 +1,27 @@
-from sqlalchemy import create_engine
 import os
+from functools import lru_cache
 
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
-DB_NAME = os.getenv("DB_NAME")
+if 'data_exporter' not in globals():
+    from mage_ai.data_preparation.decorators import data_exporter
 
-# Create the database connection URL and the SQLAlchemy engine
-# The engine is the entry point to the database for SQLAlchemy.
 
-DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+@lru_cache(maxsize=None)
+def get_engine():
+    """
+    Creates the SQLAlchemy engine on first use and reuses it afterwards.
+    The engine is the entry point to the database for SQLAlchemy.
+    """
+    from sqlalchemy import create_engine
 
+    DB_USER = os.getenv("DB_USER")
+    DB_PASSWORD = os.getenv("DB_PASSWORD")
+    DB_HOST = os.getenv("DB_HOST")
+    DB_PORT = os.getenv("DB_PORT")
+    DB_NAME = os.getenv("DB_NAME")
 
-engine = create_engine(DATABASE_URL)
+    # Create the database connection URL and the SQLAlchemy engine
+    DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    return create_engine(DATABASE_URL)
 
 
 @data_exporter
@@ -32,17 +40,11 @@ def export_data(data, *args, **kwargs):
     }
 
     # --- Database Connection ---
-    DB_USER = os.getenv("DB_USER")
-    DB_PASSWORD = os.getenv("DB_PASSWORD")
-    DB_HOST = os.getenv("DB_HOST")
-    DB_PORT = os.getenv("DB_PORT")
-    DB_NAME = os.getenv("DB_NAME")
-    DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    engine = create_engine(DATABASE_URL)
+    engine = get_engine()
 
     # Loop through the dictionary and save each DataFrame to its table
     for table_name, df in table_mappings.items():
         if not df.empty:
             print(f"Loading data into '{table_name}' table...")
             df.to_sql(table_name, engine, if_exists='replace', index=False)
-            print(f"Successfully loaded '{table_name}'.")
\ No newline at end of file
+            print(f"Successfully loaded '{table_name}'.")
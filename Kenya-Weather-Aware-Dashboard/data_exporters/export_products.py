@@ -0,0 +1,22 @@
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'data_exporter' not in globals():
+    from mage_ai.data_preparation.decorators import data_exporter
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+from utils.checkpoints import get_run_checkpoint
+from utils.warehouse import export_tables
+
+
+@data_exporter
+def export_products(df, **kwargs) -> None:
+    """
+    Exports the 'products' table to the sinks selected by 'warehouse_sink'.
+    Sinks it was already loaded into earlier in this run are skipped.
+    """
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+    export_tables({'products': df}, checkpoint=checkpoint, **kwargs)
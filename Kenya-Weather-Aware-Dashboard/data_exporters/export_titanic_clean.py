@@ -1,5 +1,9 @@
-from mage_ai.io.file import FileIO
-from pandas import DataFrame
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 if 'data_exporter' not in globals():
     from mage_ai.data_preparation.decorators import data_exporter
@@ -12,5 +16,7 @@ def export_data_to_file(df: DataFrame, **kwargs) -> None:
 
     Docs: https://docs.mage.ai/design/data-loading#example-loading-data-from-a-file
     """
+    from mage_ai.io.file import FileIO
+
     filepath = 'titanic_clean.csv'
     FileIO().export(df, filepath)
@@ -0,0 +1,34 @@
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'data_exporter' not in globals():
+    from mage_ai.data_preparation.decorators import data_exporter
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+from utils.checkpoints import get_run_checkpoint
+from utils.risk_snapshot import risk_snapshot_path, write_risk_snapshot
+from utils.warehouse import DUCKDB_SINK, duckdb_paths, export_to_sink, sink_enabled
+
+
+@data_exporter
+def export_data_to_duckdb(data: dict, **kwargs) -> None:
+    """
+    Exports a dictionary of DataFrames to an embedded DuckDB database.
+    The database file is read from 'DUCKDB_DATABASE' in 'io_config.yaml'.
+    Set the 'parquet_dir' pipeline variable to also write Parquet files.
+    Tables already loaded earlier in this run are skipped.
+    The risk service's snapshot is refreshed once the tables are loaded.
+    """
+    if not sink_enabled(DUCKDB_SINK, **kwargs):
+        print("DuckDB sink is not selected for this run. Skipping export.")
+        return
+
+    export_to_sink(DUCKDB_SINK, data, checkpoint=get_run_checkpoint(get_repo_path(), **kwargs), **kwargs)
+    database, _ = duckdb_paths(**kwargs)
+    print(f"All tables exported to DuckDB database: {database}")
+    write_risk_snapshot(
+        data.get('weather_forecasts'), risk_snapshot_path(get_repo_path(), **kwargs), cities=data.get('cities')
+    )
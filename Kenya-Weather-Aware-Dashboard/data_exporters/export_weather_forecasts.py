@@ -0,0 +1,54 @@
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'data_exporter' not in globals():
+    from mage_ai.data_preparation.decorators import data_exporter
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+import os
+
+from utils.change_detection import ForecastStateStore
+from utils.checkpoints import get_run_checkpoint
+from utils.cities import cities_for_run
+from utils.risk_snapshot import risk_snapshot_path, write_risk_snapshot
+from utils.warehouse import export_tables, upsert_table
+
+
+@data_exporter
+def export_weather_forecasts(df, **kwargs) -> None:
+    """
+    Exports the 'weather_forecasts' table to the sinks selected by 'warehouse_sink'.
+
+    The 'cities' dimension is upserted first, so rows loaded by the weather grid
+    pipeline keep the names of its extra locations.
+
+    With 'incremental_weather' set, only the changed rows are upserted by
+    (city_id, forecast_time), and the forecast hashes are committed afterwards.
+    The risk service's snapshot is refreshed once the rows are loaded.
+    Sinks the table was already loaded into earlier in this run are skipped.
+    """
+    incremental = bool(kwargs.get('incremental_weather'))
+    snapshot_path = risk_snapshot_path(get_repo_path(), **kwargs)
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+    cities = cities_for_run(get_repo_path(), **kwargs)
+    upsert_table('cities', cities, key_columns=['city_id'], checkpoint=checkpoint, **kwargs)
+    if not incremental:
+        export_tables({'weather_forecasts': df}, checkpoint=checkpoint, **kwargs)
+        write_risk_snapshot(df, snapshot_path, cities=cities)
+        return
+
+    upsert_table(
+        'weather_forecasts',
+        df,
+        key_columns=['city_id', 'forecast_time'],
+        id_column='forecast_id',
+        checkpoint=checkpoint,
+        **kwargs,
+    )
+    state_dir = os.path.join(get_repo_path(), kwargs.get('state_dir') or 'state')
+    with ForecastStateStore(state_dir) as store:
+        store.commit()
+    write_risk_snapshot(df, snapshot_path, merge=True, cities=cities)
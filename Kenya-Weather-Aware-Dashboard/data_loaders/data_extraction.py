@@ -1,80 +1,18 @@
-import os
-import requests
-import pandas as pd
-from dotenv import load_dotenv
+import sys
 from mage_ai.settings.repo import get_repo_path
 
 # This import is mandatory for any loader block
 if 'data_loader' not in globals():
     from mage_ai.data_preparation.decorators import data_loader
 
-# --- Correctly load the .env file from the project root ---
-# This is crucial for Mage to find your API key
-env_path = os.path.join(get_repo_path(), '.env')
-load_dotenv(dotenv_path=env_path)
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
 
-# --- Constants ---
-OPENWEATHER_API_URL = "https://api.openweathermap.org/data/2.5/forecast"
-FAKE_STORE_API_URL = "https://fakestoreapi.com/products"
-FAKER_API_CUSTOMERS_URL = "https://fakerapi.it/api/v1/persons?_quantity=50"
-
-CITIES = {
-    "Nairobi": {"lat": -1.2921, "lon": 36.8219},
-    "Mombasa": {"lat": -4.0435, "lon": 39.6682},
-    "Kisumu": {"lat": -0.1022, "lon": 34.7617},
-    "Eldoret": {"lat": 0.5143, "lon": 35.2698},
-    "Nakuru": {"lat": -0.3031, "lon": 36.0800}
-}
-
-# --- Data Fetching Functions ---
-# These are your helper functions. They are not decorated.
-
-def fetch_weather_data(api_key, cities):
-    """Fetches 5-day/3-hour weather forecast for multiple cities."""
-    all_forecasts = []
-    print("Fetching weather data...")
-    if not api_key:
-        raise Exception("Error: OPENWEATHER_API_KEY not found. Please check your .env file setup in the Mage block.")
-
-    for city, coords in cities.items():
-        params = {"lat": coords["lat"], "lon": coords["lon"], "appid": api_key, "units": "metric"}
-        try:
-            response = requests.get(OPENWEATHER_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            for forecast in data.get('list', []):
-                forecast['city'] = city
-            all_forecasts.extend(data.get('list', []))
-            print(f"  Successfully fetched weather for {city}.")
-        except requests.exceptions.RequestException as e:
-            print(f"  Error fetching weather for {city}: {e}")
-    
-    print("Weather data fetching complete.")
-    return all_forecasts
-
-def fetch_product_data():
-    """Fetches product data from the Fake Store API."""
-    print("Fetching product data...")
-    try:
-        response = requests.get(FAKE_STORE_API_URL)
-        response.raise_for_status()
-        print("  Successfully fetched product data.")
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"  Error fetching product data: {e}")
-        return None
-
-def fetch_customer_data():
-    """Fetches mock customer data from FakerAPI."""
-    print("Fetching customer data...")
-    try:
-        response = requests.get(FAKER_API_CUSTOMERS_URL)
-        response.raise_for_status()
-        print("  Successfully fetched customer data.")
-        return response.json().get('data', [])
-    except requests.exceptions.RequestException as e:
-        print(f"  Error fetching customer data: {e}")
-        return None
+from utils.checkpoints import checkpointed_locations, checkpointed_raw, get_run_checkpoint
+from utils.config import get_openweather_api_key
+from utils.extract import CITIES, fetch_customer_data, fetch_product_data, fetch_weather_data
+from utils.resilience import breaker_state_dir, log_extract_metrics, persisted_breakers, reset_extract_metrics
 
 # --- Main Mage Function ---
 # This is the ONLY function that should be decorated.
@@ -84,19 +22,34 @@ def fetch_customer_data():
 def load_raw_data(*args, **kwargs):
     """
     Loads data from OpenWeather, Fake Store, and Faker APIs.
+    Payloads already saved in this run's checkpoint are reused instead of re-fetched.
     """
-    api_key = os.getenv("OPENWEATHER_API_KEY")
+    # The .env file in the project root is read here, on first use, not at import.
+    api_key = get_openweather_api_key()
     
-    # Call the helper functions defined above
-    weather_raw = fetch_weather_data(api_key, CITIES)
-    products_raw = fetch_product_data()
-    customers_raw = fetch_customer_data()
+    reset_extract_metrics()
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+
+    # Call the shared helper functions from utils/extract.py
+    breaker_dir = breaker_state_dir(get_repo_path(), **kwargs)
+    with persisted_breakers(breaker_dir, ["openweather", "fakestore", "fakerapi"]):
+        weather_raw = checkpointed_locations(
+            checkpoint,
+            'weather',
+            CITIES,
+            lambda missing: fetch_weather_data(api_key, missing),
+            tables=['weather_forecasts'],
+        )
+        products_raw = checkpointed_raw(checkpoint, 'products', fetch_product_data)
+        customers_raw = checkpointed_raw(checkpoint, 'customers', fetch_customer_data)
 
     print("Data extraction complete. Returning raw data to the next block.")
+    metrics = log_extract_metrics()
 
     # Return the data as a dictionary so the next block can use it
     return {
         "weather": weather_raw,
         "products": products_raw,
-        "customers": customers_raw
+        "customers": customers_raw,
+        "metrics": metrics
     }
@@ -0,0 +1,25 @@
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+from utils.checkpoints import checkpointed_raw, get_run_checkpoint
+from utils.extract import fetch_customer_data
+from utils.resilience import breaker_state_dir, log_extract_metrics, persisted_breakers, reset_extract_metrics
+
+
+@data_loader
+def load_customers(*args, **kwargs):
+    """
+    Loads mock customers from FakerAPI, or from this run's checkpoint when resuming.
+    """
+    reset_extract_metrics(["fakerapi"])
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+    with persisted_breakers(breaker_state_dir(get_repo_path(), **kwargs), ["fakerapi"]):
+        customers_raw = checkpointed_raw(checkpoint, 'customers', fetch_customer_data)
+    return {"customers": customers_raw, "metrics": log_extract_metrics(["fakerapi"])}
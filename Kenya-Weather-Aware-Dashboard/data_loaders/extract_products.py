@@ -0,0 +1,25 @@
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+from utils.checkpoints import checkpointed_raw, get_run_checkpoint
+from utils.extract import fetch_product_data
+from utils.resilience import breaker_state_dir, log_extract_metrics, persisted_breakers, reset_extract_metrics
+
+
+@data_loader
+def load_products(*args, **kwargs):
+    """
+    Loads the product catalog from the Fake Store API, or from this run's checkpoint when resuming.
+    """
+    reset_extract_metrics(["fakestore"])
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+    with persisted_breakers(breaker_state_dir(get_repo_path(), **kwargs), ["fakestore"]):
+        products_raw = checkpointed_raw(checkpoint, 'products', fetch_product_data)
+    return {"products": products_raw, "metrics": log_extract_metrics(["fakestore"])}
@@ -0,0 +1,40 @@
+import os
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+from utils.checkpoints import checkpointed_locations, get_run_checkpoint
+from utils.config import get_openweather_api_key
+from utils.extract import fetch_weather_data, load_locations
+from utils.resilience import breaker_state_dir, log_extract_metrics, persisted_breakers, reset_extract_metrics
+
+
+@data_loader
+def load_weather(*args, **kwargs):
+    """
+    Loads the 5-day/3-hour forecasts for every city from the OpenWeather API.
+    Set the 'locations_file' pipeline variable to fetch a list of locations from
+    a CSV or JSON file instead of the five built-in cities. A resumed run reuses
+    the forecasts saved in its checkpoint and only fetches locations that failed.
+    """
+    locations_file = kwargs.get('locations_file')
+    if locations_file and not os.path.isabs(locations_file):
+        locations_file = os.path.join(get_repo_path(), locations_file)
+
+    reset_extract_metrics(["openweather"])
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+    with persisted_breakers(breaker_state_dir(get_repo_path(), **kwargs), ["openweather"]):
+        weather_raw = checkpointed_locations(
+            checkpoint,
+            'weather',
+            load_locations(locations_file),
+            lambda missing: fetch_weather_data(get_openweather_api_key(), missing),
+            tables=['weather_forecasts'],
+        )
+    return {"weather": weather_raw, "metrics": log_extract_metrics(["openweather"])}
@@ -1,7 +1,9 @@
-import io
-import pandas as pd
-import requests
-from pandas import DataFrame
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 if 'data_loader' not in globals():
     from mage_ai.data_preparation.decorators import data_loader
@@ -14,6 +16,8 @@ def load_data_from_api(**kwargs) -> DataFrame:
     """
     Template for loading data from API
     """
+    import pandas as pd
+
     url = 'https://raw.githubusercontent.com/datasciencedojo/datasets/master/titanic.csv?raw=True'
 
     return pd.read_csv(url)
@@ -0,0 +1,68 @@
+import os
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+from utils.checkpoints import checkpointed_city_table, get_run_checkpoint
+from utils.cities import build_cities_table
+from utils.config import get_openweather_api_key
+from utils.contracts import validate_table
+from utils.extract import load_locations
+from utils.imputation import median_stats_path
+from utils.sharded_ingestion import ingest_weather_sharded, merge_shards
+
+
+@data_loader
+def load_weather_grid(*args, **kwargs):
+    """
+    Loads forecasts for a national grid of locations using several worker processes.
+
+    Pipeline variables:
+        locations_file: CSV or JSON list of locations (relative to the project folder).
+        weather_shards: number of shards, defaults to the number of CPU cores.
+        staging_dir: folder for the per-shard Parquet partitions.
+    A resumed run reuses the rows saved in its checkpoint and only fetches locations that have none.
+    """
+    locations_file = kwargs.get('locations_file') or 'locations/kenya_cities.csv'
+    if not os.path.isabs(locations_file):
+        locations_file = os.path.join(get_repo_path(), locations_file)
+
+    staging_dir = kwargs.get('staging_dir') or 'staging/weather_grid'
+    if not os.path.isabs(staging_dir):
+        staging_dir = os.path.join(get_repo_path(), staging_dir)
+
+    shard_count = kwargs.get('weather_shards')
+
+    locations = load_locations(locations_file)
+    cities = build_cities_table(locations)
+    stats_path = median_stats_path(get_repo_path(), 'weather_forecasts', **kwargs)
+
+    def ingest(missing, saved):
+        partition_paths = ingest_weather_sharded(
+            missing,
+            get_openweather_api_key(),
+            staging_dir,
+            shard_count=int(shard_count) if shard_count else None,
+            cities=cities,
+        )
+        return merge_shards(partition_paths, saved=saved, cities=cities, stats_path=stats_path)
+
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+    return checkpointed_city_table(checkpoint, 'weather_forecasts', locations, cities, ingest)
+
+
+@test
+def test_output(output, *args, **kwargs) -> None:
+    """
+    Checks the output against the 'weather_forecasts' table contract.
+    Set 'contract_sample_rows' to only check a random sample of rows.
+    """
+    validate_table(output, 'weather_forecasts', sample_rows=kwargs.get('contract_sample_rows'))
@@ -1,21 +1,26 @@
-from pandas import DataFrame
-import math
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+from mage_ai.settings.repo import get_repo_path
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 if 'transformer' not in globals():
     from mage_ai.data_preparation.decorators import transformer
 if 'test' not in globals():
     from mage_ai.data_preparation.decorators import test
 
-def select_number_columns(df: DataFrame) -> DataFrame:
-    return df[['Age', 'Fare', 'Parch', 'Pclass', 'SibSp', 'Survived']]
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
 
+from utils.imputation import fill_missing_values_with_median, get_median_stats, median_stats_path
 
-def fill_missing_values_with_median(df: DataFrame) -> DataFrame:
-    for col in df.columns:
-        values = sorted(df[col].dropna().tolist())
-        median_value = values[math.floor(len(values) / 2)]
-        df[[col]] = df[[col]].fillna(median_value)
-    return df
+
+def select_number_columns(df: DataFrame) -> DataFrame:
+    return df[['Age', 'Fare', 'Parch', 'Pclass', 'SibSp', 'Survived']]
 
 
 @transformer
@@ -33,8 +38,17 @@ def transform_df(df: DataFrame, *args, **kwargs) -> DataFrame:
         DataFrame: Transformed data frame
     """
     # Specify your transformation logic here
-
-    return fill_missing_values_with_median(select_number_columns(df))
+    df = select_number_columns(df)
+
+    # Medians are fitted once and reused by later batches unless 'refit_medians' is set.
+    # They are kept in 'state_dir', so later runs reuse them too.
+    stats = get_median_stats(
+        df,
+        'titanic',
+        refit=kwargs.get('refit_medians', False),
+        stats_path=median_stats_path(get_repo_path(), 'titanic', **kwargs),
+    )
+    return fill_missing_values_with_median(df, stats)
 
 
 @test
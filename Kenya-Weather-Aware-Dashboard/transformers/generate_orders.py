@@ -0,0 +1,35 @@
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'transformer' not in globals():
+    from mage_ai.data_preparation.decorators import transformer
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+from utils.checkpoints import checkpointed_table, get_run_checkpoint
+from utils.contracts import validate_table
+from utils.transform import generate_mock_orders
+
+
+@transformer
+def generate_orders(customers_df, products_df, *args, **kwargs):
+    """
+    Generates the mock 'orders' table once both customers and products are ready.
+    The upstream blocks are, in order: transform_customers, transform_products.
+    The orders are random, so a resumed run reads them back from its checkpoint.
+    """
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+    return checkpointed_table(checkpoint, 'orders', lambda: generate_mock_orders(customers_df, products_df))
+
+
+@test
+def test_output(output, *args, **kwargs) -> None:
+    """
+    Checks the output against the 'orders' table contract.
+    Set 'contract_sample_rows' to only check a random sample of rows.
+    """
+    validate_table(output, 'orders', sample_rows=kwargs.get('contract_sample_rows'))
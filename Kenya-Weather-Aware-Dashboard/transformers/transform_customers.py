@@ -0,0 +1,34 @@
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'transformer' not in globals():
+    from mage_ai.data_preparation.decorators import transformer
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+from utils.checkpoints import checkpointed_table, get_run_checkpoint
+from utils.contracts import validate_table
+from utils.transform import transform_customer_data
+
+
+@transformer
+def transform_customers(data: dict, *args, **kwargs):
+    """
+    Turns the raw FakerAPI payload into the 'customers' table with Kenyan cities.
+    The table is saved in this run's checkpoint, so a resumed run keeps the same cities.
+    """
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+    return checkpointed_table(checkpoint, 'customers', lambda: transform_customer_data(data.get('customers')))
+
+
+@test
+def test_output(output, *args, **kwargs) -> None:
+    """
+    Checks the output against the 'customers' table contract.
+    Set 'contract_sample_rows' to only check a random sample of rows.
+    """
+    validate_table(output, 'customers', sample_rows=kwargs.get('contract_sample_rows'))
@@ -0,0 +1,33 @@
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'transformer' not in globals():
+    from mage_ai.data_preparation.decorators import transformer
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+from utils.checkpoints import checkpointed_table, get_run_checkpoint
+from utils.contracts import validate_table
+from utils.transform import transform_product_data
+
+
+@transformer
+def transform_products(data: dict, *args, **kwargs):
+    """
+    Turns the raw Fake Store payload into the 'products' table.
+    """
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+    return checkpointed_table(checkpoint, 'products', lambda: transform_product_data(data.get('products')))
+
+
+@test
+def test_output(output, *args, **kwargs) -> None:
+    """
+    Checks the output against the 'products' table contract.
+    Set 'contract_sample_rows' to only check a random sample of rows.
+    """
+    validate_table(output, 'products', sample_rows=kwargs.get('contract_sample_rows'))
@@ -0,0 +1,63 @@
+import sys
+from mage_ai.settings.repo import get_repo_path
+
+if 'transformer' not in globals():
+    from mage_ai.data_preparation.decorators import transformer
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+# Make the project's shared helpers in 'utils/' importable from this block.
+if get_repo_path() not in sys.path:
+    sys.path.insert(0, get_repo_path())
+
+import os
+
+from utils.change_detection import ForecastStateStore, detect_weather_changes, payload_hashes
+from utils.checkpoints import checkpointed_table, get_run_checkpoint
+from utils.cities import cities_for_run
+from utils.contracts import validate_table
+from utils.imputation import median_stats_path
+from utils.transform import transform_weather_data
+
+
+@transformer
+def transform_weather(data: dict, *args, **kwargs):
+    """
+    Turns the raw OpenWeather payload into the 'weather_forecasts' table.
+
+    With the 'incremental_weather' pipeline variable set, cities whose payload is
+    unchanged since the last export are skipped and only new or changed rows are
+    returned. Hashes are kept in 'state_dir' (default: 'state/').
+    A resumed run reads the table back from its checkpoint.
+    """
+    checkpoint = get_run_checkpoint(get_repo_path(), **kwargs)
+    return checkpointed_table(checkpoint, 'weather_forecasts', lambda: _transform_weather(data.get('weather'), **kwargs))
+
+
+def _transform_weather(weather_raw: list, **kwargs):
+    refit_medians = kwargs.get('refit_medians', False)
+    stats_path = median_stats_path(get_repo_path(), 'weather_forecasts', **kwargs)
+    # The same 'cities' table export_weather_forecasts loads, so extra locations get their ids.
+    cities = cities_for_run(get_repo_path(), **kwargs)
+    if not kwargs.get('incremental_weather'):
+        return transform_weather_data(weather_raw, refit_medians=refit_medians, cities=cities, stats_path=stats_path)
+
+    state_dir = os.path.join(get_repo_path(), kwargs.get('state_dir') or 'state')
+    with ForecastStateStore(state_dir) as store:
+        changed_raw = detect_weather_changes(weather_raw, store)
+        weather_df = store.changed_rows(
+            transform_weather_data(changed_raw, refit_medians=refit_medians, cities=cities, stats_path=stats_path)
+        )
+        store.stage(payload_hashes(changed_raw), weather_df)
+
+    print(f"{len(weather_df)} weather rows changed since the last export.")
+    return weather_df
+
+
+@test
+def test_output(output, *args, **kwargs) -> None:
+    """
+    Checks the output against the 'weather_forecasts' table contract.
+    Set 'contract_sample_rows' to only check a random sample of rows.
+    """
+    validate_table(output, 'weather_forecasts', sample_rows=kwargs.get('contract_sample_rows'))
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+
+# --- Forecast Change Detection ---
+# Most of the 40 forecast steps returned for a city are the same from one run to
+# the next. Content hashes per city payload and per (city, forecast_time) row are
+# kept in a small SQLite file, so a run only transforms and exports what changed.
+#
+# Hashes are first written as "pending" by the transformer and only promoted
+# once the exporter has loaded the rows; a failed export is retried next run.
+
+DEFAULT_STATE_FILE = 'forecast_state.sqlite'
+WEATHER_VALUE_COLUMNS = ['temperature', 'rainfall_mm', 'wind_speed_ms']
+
+
+def payload_hashes(weather_raw: list, city_key: str = 'city') -> dict:
+    """Returns a SHA-256 of each city's raw forecast entries, keyed by city."""
+    by_city = {}
+    for forecast in weather_raw or []:
+        by_city.setdefault(forecast[city_key], []).append(forecast)
+    return {
+        city: hashlib.sha256(json.dumps(entries, sort_keys=True).encode('utf-8')).hexdigest()
+        for city, entries in by_city.items()
+    }
+
+
+def row_hashes(df, value_columns: list = None):
+    """Hashes the value columns of every row in one vectorized pass (signed 64-bit for SQLite)."""
+    import pandas as pd
+
+    hashes = pd.util.hash_pandas_object(df[value_columns or WEATHER_VALUE_COLUMNS], index=False)
+    return pd.Series(hashes.to_numpy().view('int64'), index=df.index)
+
+
+class ForecastStateStore:
+    """SQLite-backed record of the last exported payload and row hashes."""
+
+    def __init__(self, state_dir: str, file_name: str = DEFAULT_STATE_FILE):
+        import sqlite3
+
+        os.makedirs(state_dir, exist_ok=True)
+        self.path = os.path.join(state_dir, file_name)
+        self.conn = sqlite3.connect(self.path)
+        for prefix in ('', 'pending_'):
+            self.conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {prefix}city_payloads '
+                '(city TEXT PRIMARY KEY, payload_hash TEXT NOT NULL)'
+            )
+            self.conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {prefix}forecast_rows '
+                '(city TEXT NOT NULL, forecast_time TEXT NOT NULL, row_hash INTEGER NOT NULL, '
+                'PRIMARY KEY (city, forecast_time))'
+            )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def changed_cities(self, hashes: dict) -> set:
+        """Cities whose payload hash differs from the last exported one."""
+        known = dict(self.conn.execute('SELECT city, payload_hash FROM city_payloads'))
+        return {city for city, payload_hash in hashes.items() if known.get(city) != payload_hash}
+
+    def changed_rows(self, df, city_column: str = 'city_id', value_columns: list = None):
+        """Returns only the rows of df that are new or whose values changed."""
+        import pandas as pd
+
+        if df.empty:
+            return df
+
+        current = pd.DataFrame({
+            'city': df[city_column].astype(str).to_numpy(),
+            'forecast_time': df['forecast_time'].astype(str).to_numpy(),
+            'row_hash': row_hashes(df, value_columns).to_numpy(),
+        })
+        cities = current['city'].unique().tolist()
+        placeholders = ','.join('?' * len(cities))
+        known = pd.read_sql_query(
+            f'SELECT city, forecast_time, row_hash AS known_hash FROM forecast_rows WHERE city IN ({placeholders})',
+            self.conn,
+            params=cities,
+        )
+        merged = current.merge(known, on=['city', 'forecast_time'], how='left')
+        changed_mask = (merged['known_hash'] != merged['row_hash']).to_numpy()
+        return df[changed_mask]
+
+    def stage(self, hashes: dict, df, city_column: str = 'city_id', value_columns: list = None) -> None:
+        """Records the hashes of this run's payloads and rows as pending until commit()."""
+        # Anything still pending belongs to an earlier run whose export failed.
+        self.conn.execute('DELETE FROM pending_city_payloads')
+        self.conn.execute('DELETE FROM pending_forecast_rows')
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO pending_city_payloads VALUES (?, ?)', hashes.items()
+        )
+        if not df.empty:
+            rows = zip(
+                df[city_column].astype(str),
+                df['forecast_time'].astype(str),
+                row_hashes(df, value_columns).tolist(),
+            )
+            self.conn.executemany('INSERT OR REPLACE INTO pending_forecast_rows VALUES (?, ?, ?)', rows)
+        self.conn.commit()
+
+    def commit(self) -> None:
+        """Promotes pending hashes once their rows have been exported."""
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO city_payloads SELECT * FROM pending_city_payloads')
+            self.conn.execute('INSERT OR REPLACE INTO forecast_rows SELECT * FROM pending_forecast_rows')
+            self.conn.execute('DELETE FROM pending_city_payloads')
+            self.conn.execute('DELETE FROM pending_forecast_rows')
+
+
+def detect_weather_changes(weather_raw: list, store: ForecastStateStore) -> list:
+    """Drops the raw entries of cities whose payload is unchanged since the last export."""
+    changed = store.changed_cities(payload_hashes(weather_raw))
+    print(f"{len(changed)} cities have changed forecasts.")
+    return [forecast for forecast in weather_raw or [] if forecast['city'] in changed]
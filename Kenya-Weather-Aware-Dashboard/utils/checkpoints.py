@@ -0,0 +1,208 @@
+import glob
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+# --- Run Checkpoints ---
+# Each pipeline run keeps its intermediate data under '<checkpoint_dir>/<run id>/':
+#   raw/<source>.json        raw API payloads, written by the loaders
+#   tables/<table>.parquet   transformed tables, written by the transformers
+#   loaded/<table>.<sink>    empty marker files, written once a table is loaded
+# A run that fails part-way can be resumed with the same run id: finished API
+# calls and transforms are read back from disk, and tables that were already
+# loaded are skipped, so only the remaining work is repeated.
+#
+# The run id is the 'run_id' pipeline variable, or else the run's execution date
+# (which Mage keeps when a failed run is retried). Without either, checkpoints are off.
+
+DEFAULT_CHECKPOINT_DIR = 'checkpoints'
+DEFAULT_KEEP_RUNS = 10
+
+
+def _atomic_write(path: str, write) -> None:
+    """Calls write(file) on a temporary file and renames it into place."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class RunCheckpoint:
+    """Raw payloads, transformed tables and load status for one run."""
+
+    def __init__(self, root: str, run_id: str):
+        self.run_id = run_id
+        self.path = os.path.join(root, run_id)
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, *parts) -> str:
+        return os.path.join(self.path, *parts)
+
+    def has_raw(self, source: str) -> bool:
+        return os.path.exists(self._file('raw', f'{source}.json'))
+
+    def save_raw(self, source: str, payload) -> None:
+        _atomic_write(self._file('raw', f'{source}.json'), lambda f: f.write(json.dumps(payload).encode('utf-8')))
+
+    def load_raw(self, source: str):
+        with open(self._file('raw', f'{source}.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def has_table(self, table_name: str) -> bool:
+        return os.path.exists(self._file('tables', f'{table_name}.parquet'))
+
+    def save_table(self, table_name: str, df) -> None:
+        _atomic_write(self._file('tables', f'{table_name}.parquet'), lambda f: df.to_parquet(f, index=False))
+
+    def load_table(self, table_name: str):
+        import pandas as pd
+        return pd.read_parquet(self._file('tables', f'{table_name}.parquet'))
+
+    def is_loaded(self, table_name: str, sink: str) -> bool:
+        return os.path.exists(self._file('loaded', f'{table_name}.{sink}'))
+
+    def mark_loaded(self, table_name: str, sink: str) -> None:
+        _atomic_write(self._file('loaded', f'{table_name}.{sink}'), lambda f: None)
+
+    def discard_table(self, table_name: str) -> None:
+        """Forgets a saved table and its load markers, so it is rebuilt and loaded again."""
+        stale = glob.glob(self._file('loaded', f'{glob.escape(table_name)}.*'))
+        for path in [self._file('tables', f'{table_name}.parquet')] + stale:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def resolve_run_id(**kwargs) -> str:
+    """The 'run_id' pipeline variable, or the run's execution date, or None."""
+    run_id = kwargs.get('run_id')
+    if run_id:
+        return str(run_id)
+    execution_date = kwargs.get('execution_date')
+    if isinstance(execution_date, datetime):
+        return execution_date.strftime('%Y%m%dT%H%M%S')
+    if execution_date:
+        return str(execution_date).replace(':', '').replace(' ', 'T')
+    return None
+
+
+def prune_checkpoints(root: str, keep: int) -> None:
+    """Deletes all but the `keep` most recently used run folders."""
+    if not os.path.isdir(root):
+        return
+    runs = sorted(
+        (entry for entry in os.scandir(root) if entry.is_dir()),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in runs[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def get_run_checkpoint(repo_path: str, **kwargs):
+    """
+    Returns the RunCheckpoint for this run, or None when no run id is available.
+    'checkpoint_dir' (default 'checkpoints/', relative to the Mage project) sets the
+    folder and 'checkpoint_keep_runs' how many runs are kept on disk.
+    """
+    run_id = resolve_run_id(**kwargs)
+    if not run_id:
+        return None
+    root = kwargs.get('checkpoint_dir') or DEFAULT_CHECKPOINT_DIR
+    if not os.path.isabs(root):
+        root = os.path.join(repo_path, root)
+
+    is_new_run = not os.path.isdir(os.path.join(root, run_id))
+    checkpoint = RunCheckpoint(root, run_id)
+    if is_new_run:
+        prune_checkpoints(root, int(kwargs.get('checkpoint_keep_runs') or DEFAULT_KEEP_RUNS))
+    return checkpoint
+
+
+def checkpointed_raw(checkpoint, source: str, fetch):
+    """
+    Returns the raw payload for source from the checkpoint, or calls fetch() and saves it.
+    Failed fetches (None or empty) are not saved, so a resumed run tries them again.
+    """
+    if checkpoint and checkpoint.has_raw(source):
+        print(f"Reusing the '{source}' payload from run {checkpoint.run_id}.")
+        return checkpoint.load_raw(source)
+    payload = fetch()
+    if checkpoint and payload:
+        checkpoint.save_raw(source, payload)
+    return payload
+
+
+def checkpointed_locations(checkpoint, source: str, locations: dict, fetch,
+                           key: str = 'city', tables: list = ()):
+    """
+    Like checkpointed_raw, for payloads made of per-location entries (weather).
+    A fetch where some locations fail still returns the others, so the payload is
+    checked per location: entries saved for a location are reused, and fetch() is
+    only called with the {name: coords} of locations that have none yet.
+
+    `tables` names the tables transformed from this payload. They are discarded
+    whenever new entries are saved, so the refetched locations reach the warehouse.
+    """
+    saved = checkpoint.load_raw(source) if checkpoint and checkpoint.has_raw(source) else []
+    done = {entry[key] for entry in saved}
+    missing = {name: coords for name, coords in locations.items() if name not in done}
+    if not missing:
+        if checkpoint:
+            print(f"Reusing the '{source}' payload from run {checkpoint.run_id}.")
+        return saved
+    if done:
+        print(f"Reusing {len(done)} locations of '{source}' from run {checkpoint.run_id}; "
+              f"fetching the other {len(missing)}.")
+
+    payload = saved + (fetch(missing) or [])
+    # Keep the entries in the order of `locations`, however many resumes it took.
+    order = {name: i for i, name in enumerate(locations)}
+    payload.sort(key=lambda entry: order.get(entry[key], len(order)))
+    if checkpoint and len(payload) > len(saved):
+        checkpoint.save_raw(source, payload)
+        for table_name in tables:
+            checkpoint.discard_table(table_name)
+    return payload
+
+
+def checkpointed_city_table(checkpoint, table_name: str, locations: dict, cities, build):
+    """
+    Like checkpointed_locations, for a table built straight from the API (the weather grid).
+    Locations with rows in the saved table (matched by city_id through `cities`) are
+    kept, and build(missing, saved) is only called with the {name: coords} of the
+    others. It returns the whole table, saved rows included.
+    """
+    saved = checkpoint.load_table(table_name) if checkpoint and checkpoint.has_table(table_name) else None
+    done = set() if saved is None else set(cities.loc[cities['city_id'].isin(saved['city_id']), 'city_name'])
+    missing = {name: coords for name, coords in locations.items() if name not in done}
+    if saved is not None and not missing:
+        print(f"Reusing the transformed '{table_name}' table from run {checkpoint.run_id}.")
+        return saved
+    if done:
+        print(f"Reusing {len(done)} locations of '{table_name}' from run {checkpoint.run_id}; "
+              f"fetching the other {len(missing)}.")
+
+    df = build(missing, saved)
+    if checkpoint and df is not None and len(df) > (0 if saved is None else len(saved)):
+        # The grown table replaces the saved one, and sinks that had the partial one load it again.
+        checkpoint.discard_table(table_name)
+        checkpoint.save_table(table_name, df)
+    return df
+
+
+def checkpointed_table(checkpoint, table_name: str, transform):
+    """Returns the table from the checkpoint, or calls transform() and saves its result."""
+    if checkpoint and checkpoint.has_table(table_name):
+        print(f"Reusing the transformed '{table_name}' table from run {checkpoint.run_id}.")
+        return checkpoint.load_table(table_name)
+    df = transform()
+    if checkpoint and df is not None and not df.empty:
+        checkpoint.save_table(table_name, df)
+    return df
@@ -0,0 +1,67 @@
+import os
+
+from .extract import CITIES, load_locations
+
+# --- Cities Dimension ---
+# 'customers' and 'weather_forecasts' refer to a city by a small integer city_id
+# instead of repeating its name on every row, and the 'cities' table maps the ids
+# back to names and coordinates. Integer keys keep both tables narrow and let
+# the dashboard analyses hash-join on a 4-byte key instead of a string.
+#
+# The five CITIES always get ids 1-5, in the order they are listed. Extra
+# locations from a 'locations_file' (the weather grid) follow in file order.
+
+CITY_ID_DTYPE = 'int32'
+
+
+def build_cities_table(locations: dict = None):
+    """Returns the 'cities' table for CITIES plus any extra {name: coords} locations."""
+    import pandas as pd
+
+    coords = {**CITIES, **(locations or {})}
+    names = list(CITIES) + [name for name in coords if name not in CITIES]
+    return pd.DataFrame({
+        'city_id': pd.Series(range(1, len(names) + 1), dtype=CITY_ID_DTYPE),
+        'city_name': names,
+        'latitude': [float(coords[name]['lat']) for name in names],
+        'longitude': [float(coords[name]['lon']) for name in names],
+    })
+
+
+def cities_for_run(repo_path: str, **kwargs):
+    """
+    The 'cities' table for this run: CITIES plus the locations in the 'locations_file'
+    pipeline variable, when it is set. Relative paths are resolved against the Mage project.
+    """
+    locations_file = kwargs.get('locations_file')
+    if not locations_file:
+        return build_cities_table()
+    if not os.path.isabs(locations_file):
+        locations_file = os.path.join(repo_path, locations_file)
+    return build_cities_table(load_locations(locations_file))
+
+
+def to_city_ids(names, cities=None):
+    """
+    Maps a column of city names to their city_id in one vectorized lookup.
+    Raises ValueError when a name is not in the cities table.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if cities is None:
+        cities = build_cities_table()
+    codes = pd.Categorical(names, categories=cities['city_name']).codes
+    unknown = codes < 0
+    if unknown.any():
+        missing = sorted(set(map(str, np.asarray(names, dtype=object)[unknown])))
+        raise ValueError(f"Cities missing from the 'cities' table: {', '.join(missing[:5])}.")
+    return cities['city_id'].to_numpy()[codes]
+
+
+def city_names(city_ids, cities=None) -> list:
+    """Names for a short list of city_id values, falling back to the id for unknown ones."""
+    if cities is None:
+        cities = build_cities_table()
+    lookup = dict(zip(cities['city_id'].tolist(), cities['city_name']))
+    return [lookup.get(int(city_id), str(city_id)) for city_id in city_ids]
@@ -0,0 +1,21 @@
+import os
+from functools import lru_cache
+
+# --- Lazy Configuration ---
+# The .env file is read the first time a setting is needed rather than when a
+# block is imported, so importing a block has no side effects.
+
+
+@lru_cache(maxsize=None)
+def load_project_env() -> None:
+    """Loads the .env file from the Mage project root, once per process."""
+    from dotenv import load_dotenv
+    from mage_ai.settings.repo import get_repo_path
+
+    load_dotenv(dotenv_path=os.path.join(get_repo_path(), '.env'))
+
+
+def get_openweather_api_key():
+    """Returns OPENWEATHER_API_KEY after making sure the .env file has been read."""
+    load_project_env()
+    return os.getenv("OPENWEATHER_API_KEY")
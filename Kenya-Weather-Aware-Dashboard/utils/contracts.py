@@ -0,0 +1,185 @@
+import time
+from dataclasses import dataclass, field
+
+from .extract import CITIES
+
+# --- Table Contracts ---
+# Declarative expectations for the output tables: column dtypes,
+# nullability, key uniqueness and value ranges. The Mage '@test' functions check
+# each block's output against its contract, so type drift (e.g. rainfall_mm
+# turning into 'object', or order_date carrying microseconds) fails the block
+# instead of slowing down the load and the dashboard joins.
+#
+# Every check is a vectorized pandas operation. Dtype and column checks look at
+# the schema only; the value checks can run on a random sample of rows.
+
+DELIVERY_STATUSES = {'Delivered', 'Shipped', 'On Time', 'Delayed', 'Cancelled'}
+
+
+class ContractViolation(Exception):
+    """Raised when a table does not match its contract. Lists every failed check."""
+
+    def __init__(self, table_name: str, failures: list):
+        self.table_name = table_name
+        self.failures = failures
+        super().__init__(f"'{table_name}' broke its contract:\n  - " + "\n  - ".join(failures))
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    # One of 'int', 'float', 'string' or 'datetime'.
+    kind: str
+    nullable: bool = False
+    min_value: float = None
+    max_value: float = None
+    allowed: frozenset = None
+    # For 'datetime' columns: values must fall on whole seconds.
+    whole_seconds: bool = False
+
+
+@dataclass(frozen=True)
+class TableContract:
+    columns: dict
+    unique_keys: list = field(default_factory=list)
+
+
+TABLE_CONTRACTS = {
+    'cities': TableContract(
+        columns={
+            'city_id': ColumnSpec('int', min_value=1),
+            'city_name': ColumnSpec('string'),
+            'latitude': ColumnSpec('float', min_value=-90, max_value=90),
+            'longitude': ColumnSpec('float', min_value=-180, max_value=180),
+        },
+        unique_keys=[['city_id'], ['city_name']],
+    ),
+    'weather_forecasts': TableContract(
+        columns={
+            'forecast_id': ColumnSpec('int', min_value=1),
+            'city_id': ColumnSpec('int', min_value=1),
+            'forecast_time': ColumnSpec('datetime', whole_seconds=True),
+            'temperature': ColumnSpec('float', min_value=-30, max_value=60),
+            'rainfall_mm': ColumnSpec('float', min_value=0, max_value=500),
+            'wind_speed_ms': ColumnSpec('float', min_value=0, max_value=100),
+        },
+        unique_keys=[['forecast_id'], ['city_id', 'forecast_time']],
+    ),
+    'products': TableContract(
+        columns={
+            'product_id': ColumnSpec('int', min_value=1),
+            'name': ColumnSpec('string'),
+            'price': ColumnSpec('float', min_value=0),
+            'category': ColumnSpec('string'),
+        },
+        unique_keys=[['product_id']],
+    ),
+    'customers': TableContract(
+        columns={
+            'customer_id': ColumnSpec('int', min_value=1),
+            'first_name': ColumnSpec('string'),
+            'last_name': ColumnSpec('string'),
+            'email': ColumnSpec('string', nullable=True),
+            # Customers are only ever assigned one of the five CITIES (ids 1-5).
+            'city_id': ColumnSpec('int', allowed=frozenset(range(1, len(CITIES) + 1))),
+        },
+        unique_keys=[['customer_id']],
+    ),
+    'orders': TableContract(
+        columns={
+            'order_id': ColumnSpec('int', min_value=1),
+            'customer_id': ColumnSpec('int', min_value=1),
+            'product_id': ColumnSpec('int', min_value=1),
+            'order_date': ColumnSpec('datetime', whole_seconds=True),
+            'quantity': ColumnSpec('int', min_value=1, max_value=100),
+            'delivery_status': ColumnSpec('string', allowed=frozenset(DELIVERY_STATUSES)),
+        },
+        unique_keys=[['order_id']],
+    ),
+}
+
+
+def _kind_matches(series, kind: str) -> bool:
+    from pandas.api import types
+
+    if kind == 'int':
+        return types.is_integer_dtype(series)
+    if kind == 'float':
+        return types.is_float_dtype(series)
+    if kind == 'datetime':
+        return types.is_datetime64_any_dtype(series)
+    if kind == 'string':
+        return types.is_string_dtype(series) or types.is_object_dtype(series)
+    raise ValueError(f"Unknown column kind '{kind}'.")
+
+
+def check_contract(df, contract: TableContract, sample_rows: int = None, seed: int = 0) -> list:
+    """
+    Returns a list of failed checks (empty when df honours the contract).
+    With sample_rows set, value and uniqueness checks only look at that many
+    random rows, so duplicates are only found within the sample.
+    """
+    failures = []
+    missing = [column for column in contract.columns if column not in df.columns]
+    unexpected = [column for column in df.columns if column not in contract.columns]
+    if missing:
+        failures.append(f"missing columns: {', '.join(missing)}")
+    if unexpected:
+        failures.append(f"unexpected columns: {', '.join(map(str, unexpected))}")
+
+    rows = df
+    if sample_rows and len(df) > sample_rows:
+        import numpy as np
+        # Random positions rather than df.sample, which shuffles every row of a large frame.
+        # np.unique drops repeated draws, so repeated rows never look like duplicate keys.
+        positions = np.unique(np.random.default_rng(seed).integers(0, len(df), sample_rows))
+        rows = df.iloc[positions]
+
+    for column, spec in contract.columns.items():
+        if column not in df.columns:
+            continue
+        values = rows[column]
+        if not _kind_matches(df[column], spec.kind):
+            failures.append(f"{column}: expected {spec.kind} dtype, got {df[column].dtype}")
+            continue
+
+        nulls = values.isna()
+        if not spec.nullable and nulls.any():
+            failures.append(f"{column}: {int(nulls.sum())} nulls in a non-nullable column")
+        if spec.min_value is not None and (values < spec.min_value).any():
+            failures.append(f"{column}: {int((values < spec.min_value).sum())} values below {spec.min_value}")
+        if spec.max_value is not None and (values > spec.max_value).any():
+            failures.append(f"{column}: {int((values > spec.max_value).sum())} values above {spec.max_value}")
+        if spec.allowed is not None:
+            outside = ~values.isin(spec.allowed) & ~nulls
+            if outside.any():
+                examples = ', '.join(map(str, values[outside].unique()[:3]))
+                failures.append(f"{column}: {int(outside.sum())} values not allowed (e.g. {examples})")
+        if spec.whole_seconds:
+            fractional = values.notna() & (values.dt.floor('s') != values)
+            if fractional.any():
+                failures.append(f"{column}: {int(fractional.sum())} timestamps with sub-second precision")
+
+    for key in contract.unique_keys:
+        if all(column in df.columns for column in key):
+            duplicates = rows.duplicated(subset=key)
+            if duplicates.any():
+                failures.append(f"{', '.join(key)}: {int(duplicates.sum())} duplicate keys")
+    return failures
+
+
+def validate_table(df, table_name: str, sample_rows: int = None, seed: int = 0) -> None:
+    """
+    Checks df against TABLE_CONTRACTS[table_name] and raises ContractViolation on failure.
+    A frame with no columns at all is the pipeline's "no data" value and is skipped.
+    """
+    if df is None or len(df.columns) == 0:
+        print(f"No '{table_name}' data to validate.")
+        return
+
+    started = time.perf_counter()
+    failures = check_contract(df, TABLE_CONTRACTS[table_name], sample_rows=sample_rows, seed=seed)
+    if failures:
+        raise ContractViolation(table_name, failures)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    sampled = f"a sample of {sample_rows} rows" if sample_rows and len(df) > sample_rows else f"all {len(df)} rows"
+    print(f"'{table_name}' honours its contract ({sampled} checked in {elapsed_ms:.1f} ms).")
@@ -0,0 +1,103 @@
+import json
+import os
+
+from .resilience import SourceUnavailableError, resilient_get
+
+# --- Constants ---
+OPENWEATHER_API_URL = "https://api.openweathermap.org/data/2.5/forecast"
+FAKE_STORE_API_URL = "https://fakestoreapi.com/products"
+FAKER_API_CUSTOMERS_URL = "https://fakerapi.it/api/v1/persons?_quantity=50"
+
+CITIES = {
+    "Nairobi": {"lat": -1.2921, "lon": 36.8219},
+    "Mombasa": {"lat": -4.0435, "lon": 39.6682},
+    "Kisumu": {"lat": -0.1022, "lon": 34.7617},
+    "Eldoret": {"lat": 0.5143, "lon": 35.2698},
+    "Nakuru": {"lat": -0.3031, "lon": 36.0800}
+}
+
+
+def load_locations(path: str = None) -> dict:
+    """
+    Loads forecast locations from a file, in the same shape as CITIES.
+
+    CSV files need 'name', 'lat' and 'lon' columns. JSON files may hold either a
+    {name: {"lat": .., "lon": ..}} mapping or a list of {"name", "lat", "lon"} records.
+    Without a path the five hard-coded CITIES are returned.
+    """
+    import csv
+
+    if not path:
+        return dict(CITIES)
+
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding='utf-8') as f:
+        if extension == '.csv':
+            records = list(csv.DictReader(f))
+        elif extension == '.json':
+            records = json.load(f)
+        else:
+            raise ValueError(f"Unsupported locations file '{path}'. Use a .csv or .json file.")
+
+    if isinstance(records, dict):
+        return {name: {"lat": float(c["lat"]), "lon": float(c["lon"])} for name, c in records.items()}
+    return {r["name"]: {"lat": float(r["lat"]), "lon": float(r["lon"])} for r in records}
+
+# --- Data Fetching Functions ---
+# Shared by the monolithic 'data_extraction' block and the per-source loaders.
+# requests is imported on first use so importing a loader block stays cheap.
+# Every call goes through resilient_get (see utils/resilience.py), which applies
+# the source's timeouts, retries and circuit breaker and records its metrics.
+
+def fetch_weather_data(api_key, cities, session=None):
+    """
+    Fetches 5-day/3-hour weather forecast for multiple cities.
+    Pass a requests.Session to reuse one connection across many locations.
+    """
+    import requests
+
+    all_forecasts = []
+    print("Fetching weather data...")
+    if not api_key:
+        raise Exception("Error: OPENWEATHER_API_KEY not found. Please check your .env file setup in the Mage block.")
+
+    for city, coords in cities.items():
+        params = {"lat": coords["lat"], "lon": coords["lon"], "appid": api_key, "units": "metric"}
+        try:
+            response = resilient_get("openweather", OPENWEATHER_API_URL, params=params, session=session)
+            data = response.json()
+            for forecast in data.get('list', []):
+                forecast['city'] = city
+            all_forecasts.extend(data.get('list', []))
+            print(f"  Successfully fetched weather for {city}.")
+        except (requests.exceptions.RequestException, SourceUnavailableError) as e:
+            print(f"  Error fetching weather for {city}: {e}")
+    
+    print("Weather data fetching complete.")
+    return all_forecasts
+
+def fetch_product_data():
+    """Fetches product data from the Fake Store API."""
+    import requests
+
+    print("Fetching product data...")
+    try:
+        response = resilient_get("fakestore", FAKE_STORE_API_URL)
+        print("  Successfully fetched product data.")
+        return response.json()
+    except (requests.exceptions.RequestException, SourceUnavailableError) as e:
+        print(f"  Error fetching product data: {e}")
+        return None
+
+def fetch_customer_data():
+    """Fetches mock customer data from FakerAPI."""
+    import requests
+
+    print("Fetching customer data...")
+    try:
+        response = resilient_get("fakerapi", FAKER_API_CUSTOMERS_URL)
+        print("  Successfully fetched customer data.")
+        return response.json().get('data', [])
+    except (requests.exceptions.RequestException, SourceUnavailableError) as e:
+        print(f"  Error fetching customer data: {e}")
+        return None
@@ -0,0 +1,167 @@
+import json
+import os
+
+# --- Median Imputation ---
+# Medians are computed for every numeric column in one vectorized pass
+# (NumPy selects the middle element with a partition instead of a full sort).
+# Fitted statistics are cached by name so incremental batches of the same table
+# reuse them instead of re-fitting on a handful of rows. The blocks also keep them
+# in a JSON file under 'state_dir', so the cache outlives each block's process.
+
+_median_stats_cache = {}
+
+
+def fit_median_stats(df, columns: list = None, by: str = None):
+    """
+    Computes the median of each numeric column, ignoring missing values.
+
+    Returns a Series indexed by column name, or a DataFrame indexed by group
+    when 'by' is given (e.g. one row of medians per city). The grouped frame also
+    keeps the overall medians in attrs['overall'], the fallback for rows whose
+    group has no median.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include='number').columns.tolist()
+    if by is None:
+        return df[columns].median(numeric_only=True)
+    stats = df.groupby(by)[columns].median(numeric_only=True)
+    stats.attrs['overall'] = df[columns].median(numeric_only=True).to_dict()
+    return stats
+
+
+def _extend_median_stats(stats, df, columns: list, by: str = None):
+    """Adds medians for columns (and, with 'by', groups) that stats has no value for yet."""
+    import pandas as pd
+
+    stat_columns = stats.index if by is None else stats.columns
+    missing_columns = [col for col in columns if col not in stat_columns]
+    if by is None:
+        return stats.combine_first(fit_median_stats(df, missing_columns)) if missing_columns else stats
+
+    overall = pd.Series(stats.attrs.get('overall', {}), dtype='float64')
+    # Groups seen so far only with missing values are fitted again, too.
+    new_rows = ~df[by].isin(stats.dropna().index)
+    if missing_columns:
+        extra = fit_median_stats(df, missing_columns, by=by)
+        stats = stats.combine_first(extra)
+        overall = overall.combine_first(pd.Series(extra.attrs['overall'], dtype='float64'))
+    if new_rows.any():
+        extra = fit_median_stats(df[new_rows], columns, by=by)
+        stats = stats.combine_first(extra)
+        overall = overall.combine_first(pd.Series(extra.attrs['overall'], dtype='float64'))
+    stats.attrs['overall'] = overall.to_dict()
+    return stats
+
+
+def get_median_stats(df, cache_key: str, columns: list = None, by: str = None,
+                     refit: bool = False, stats_path: str = None):
+    """
+    Returns cached median statistics for cache_key, fitting them on df if needed.
+    Columns or groups the cached statistics have not seen yet are fitted on df.
+
+    When stats_path is given the statistics are also read from and written to
+    that JSON file, so they survive between pipeline runs.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include='number').columns.tolist()
+
+    stats = None if refit else _median_stats_cache.get(cache_key)
+    if stats is None and not refit and stats_path and os.path.exists(stats_path):
+        stats = load_median_stats(stats_path)
+
+    if stats is not None:
+        stats = _extend_median_stats(stats, df, columns, by=by)
+    else:
+        stats = fit_median_stats(df, columns, by=by)
+
+    _median_stats_cache[cache_key] = stats
+    if stats_path:
+        save_median_stats(stats, stats_path)
+    return stats
+
+
+def fill_missing_values_with_median(df, stats=None, columns: list = None, by: str = None):
+    """
+    Fills missing values with column medians in a single vectorized fillna.
+
+    'stats' may come from fit_median_stats/get_median_stats; they are fitted on
+    df when omitted. With 'by', each row is filled from its own group's medians
+    and falls back to the fitted overall median when the group has none (or to
+    this batch's median for statistics without one).
+    """
+    import pandas as pd
+
+    if columns is None:
+        columns = df.select_dtypes(include='number').columns.tolist()
+    if stats is None:
+        stats = fit_median_stats(df, columns, by=by)
+
+    if by is None:
+        return df.fillna(stats[[col for col in columns if col in stats.index]].to_dict())
+
+    columns = [col for col in columns if col in stats.columns]
+    group_medians = stats[columns].reindex(df[by]).set_axis(df.index)
+    overall_medians = pd.Series(stats.attrs.get('overall', {}), dtype='float64').reindex(columns)
+    overall_medians = overall_medians.combine_first(df[columns].median(numeric_only=True))
+    df = df.copy()
+    df[columns] = df[columns].fillna(group_medians).fillna(overall_medians.to_dict())
+    return df
+
+
+def median_stats_path(repo_path: str, name: str, **kwargs) -> str:
+    """
+    The JSON file for a table's fitted medians: '<name>_medians.json' in 'state_dir'
+    (default 'state/'), resolved against the Mage project folder.
+    """
+    state_dir = kwargs.get('state_dir') or 'state'
+    if not os.path.isabs(state_dir):
+        state_dir = os.path.join(repo_path, state_dir)
+    return os.path.join(state_dir, f'{name}_medians.json')
+
+
+def save_median_stats(stats, stats_path: str) -> None:
+    """
+    Writes fitted median statistics to a JSON file, atomically.
+    Grouped statistics are stored as records, so group keys keep their type
+    (an integer city_id is read back as an integer, not a string).
+    """
+    import tempfile
+
+    if getattr(stats, 'ndim', 1) == 1:
+        payload = {'medians': stats.to_dict()}
+    else:
+        payload = {
+            'by': stats.index.name,
+            'groups': stats.reset_index().to_dict(orient='records'),
+            'overall': stats.attrs.get('overall', {}),
+        }
+
+    directory = os.path.dirname(os.path.abspath(stats_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.json.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, default=lambda value: value.item())
+        os.replace(temp_path, stats_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def load_median_stats(stats_path: str):
+    """Reads median statistics written by save_median_stats."""
+    import pandas as pd
+
+    with open(stats_path, encoding='utf-8') as f:
+        raw = json.load(f)
+    if 'groups' not in raw:
+        return pd.Series(raw['medians'], dtype='float64')
+    stats = pd.DataFrame.from_records(raw['groups']).set_index(raw['by'])
+    stats = stats.astype('float64')
+    stats.attrs['overall'] = raw['overall']
+    return stats
+
+
+def clear_median_stats_cache() -> None:
+    """Forgets every cached fit, forcing the next batch to re-fit."""
+    _median_stats_cache.clear()
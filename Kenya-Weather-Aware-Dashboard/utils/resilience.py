@@ -0,0 +1,327 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# --- Resilient HTTP Calls for the Extract Layer ---
+# Every call to an upstream API goes through resilient_get, which applies the
+# source's policy: connect/read timeouts, jittered exponential retries that honour
+# Retry-After, an overall deadline so a run's tail latency stays bounded, and a
+# circuit breaker that fails fast once an endpoint is known to be down.
+# Breaker state is kept under 'state_dir' between runs, because the product and
+# customer loaders make a single call per run and could never reach the threshold alone.
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+@dataclass(frozen=True)
+class SourcePolicy:
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    max_attempts: int = 4
+    backoff_base: float = 0.5
+    backoff_cap: float = 8.0
+    # Upper bound on one logical call, including every retry and wait.
+    deadline: float = 30.0
+    # Consecutive failed calls that open the breaker, and how long it stays open.
+    failure_threshold: int = 3
+    reset_timeout: float = 60.0
+
+
+SOURCE_POLICIES = {
+    "openweather": SourcePolicy(read_timeout=10.0, deadline=30.0),
+    "fakestore": SourcePolicy(read_timeout=15.0, deadline=45.0),
+    "fakerapi": SourcePolicy(read_timeout=15.0, deadline=45.0),
+}
+DEFAULT_POLICY = SourcePolicy()
+
+
+class SourceUnavailableError(Exception):
+    """Raised when a source's circuit is open or its retries are exhausted."""
+
+
+class CircuitBreaker:
+    """
+    Closed: calls flow normally. After failure_threshold consecutive failures the
+    breaker opens and calls fail immediately. Once reset_timeout has passed, one
+    trial call is let through (half-open); success closes it, failure re-opens it.
+    opened_at is wall-clock time, so it still means something in the next run's process.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+
+    def restore(self, consecutive_failures: int, opened_at: float = None) -> None:
+        with self._lock:
+            self.consecutive_failures = consecutive_failures
+            self.opened_at = opened_at
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.time()
+
+
+class SourceMetrics:
+    """Counters and a window of recent call latencies for one source."""
+
+    def __init__(self, window: int = 1000):
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_call(self, latency: float, attempts: int, failed: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.attempts += attempts
+            self.retries += max(0, attempts - 1)
+            self.failures += int(failed)
+            self.latencies.append(latency)
+
+    def record_short_circuit(self) -> None:
+        with self._lock:
+            self.short_circuited += 1
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "failures": self.failures,
+            "short_circuited": self.short_circuited,
+            "latency_p50_s": percentile(0.50),
+            "latency_p95_s": percentile(0.95),
+            "latency_max_s": round(latencies[-1], 3) if latencies else None,
+        }
+
+
+_breakers = {}
+_metrics = {}
+_registry_lock = threading.Lock()
+
+
+def get_policy(source: str) -> SourcePolicy:
+    return SOURCE_POLICIES.get(source, DEFAULT_POLICY)
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    with _registry_lock:
+        if source not in _breakers:
+            policy = get_policy(source)
+            _breakers[source] = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+        return _breakers[source]
+
+
+def get_source_metrics(source: str) -> SourceMetrics:
+    with _registry_lock:
+        return _metrics.setdefault(source, SourceMetrics())
+
+
+def get_extract_metrics() -> dict:
+    """Returns retry, failure and latency metrics for every source, plus breaker state."""
+    return {
+        source: {**metrics.summary(), "circuit": get_breaker(source).state}
+        for source, metrics in _metrics.items()
+    }
+
+
+def log_extract_metrics(sources: list = None) -> dict:
+    """Prints a one-line summary per source and returns the metrics for the block output."""
+    metrics = get_extract_metrics()
+    if sources is not None:
+        metrics = {source: m for source, m in metrics.items() if source in sources}
+    for source, m in metrics.items():
+        print(
+            f"  {source}: {m['calls']} calls, {m['retries']} retries, {m['failures']} failed, "
+            f"{m['short_circuited']} short-circuited, p95 {m['latency_p95_s']}s, circuit {m['circuit']}"
+        )
+    return metrics
+
+
+def reset_extract_metrics(sources: list = None) -> None:
+    """
+    Forgets the metrics for the given sources (default: all of them).
+    Loaders call this first, so the metrics they return cover their own run even
+    when several runs share one Python process. Breakers are kept.
+    """
+    with _registry_lock:
+        for source in list(_metrics) if sources is None else sources:
+            _metrics.pop(source, None)
+
+
+# --- Breaker State Between Runs ---
+
+def breaker_state_dir(repo_path: str, **kwargs) -> str:
+    """The folder for saved breaker state: 'circuit_breakers/' in 'state_dir' (default 'state/')."""
+    state_dir = kwargs.get('state_dir') or 'state'
+    if not os.path.isabs(state_dir):
+        state_dir = os.path.join(repo_path, state_dir)
+    return os.path.join(state_dir, 'circuit_breakers')
+
+
+def load_breaker_state(state_dir: str, sources: list) -> None:
+    """Restores each source's breaker from '<state_dir>/<source>.json', when saved."""
+    for source in sources:
+        path = os.path.join(state_dir, f'{source}.json')
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as f:
+            saved = json.load(f)
+        get_breaker(source).restore(saved['consecutive_failures'], saved['opened_at'])
+
+
+def save_breaker_state(state_dir: str, sources: list) -> None:
+    """
+    Writes each source's breaker to its own file, atomically.
+    One file per source keeps loaders that run side by side from overwriting each other.
+    """
+    os.makedirs(state_dir, exist_ok=True)
+    for source in sources:
+        breaker = get_breaker(source)
+        payload = {'consecutive_failures': breaker.consecutive_failures, 'opened_at': breaker.opened_at}
+        fd, temp_path = tempfile.mkstemp(dir=state_dir, suffix='.json.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(temp_path, os.path.join(state_dir, f'{source}.json'))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+
+@contextmanager
+def persisted_breakers(state_dir: str, sources: list):
+    """Loads the sources' breakers on entry and saves them on exit, even if the block fails."""
+    load_breaker_state(state_dir, sources)
+    try:
+        yield
+    finally:
+        save_breaker_state(state_dir, sources)
+
+
+def parse_retry_after(value: str):
+    """Returns the Retry-After header as seconds, accepting delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(policy: SourcePolicy, attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2 ** attempt))."""
+    return random.uniform(0, min(policy.backoff_cap, policy.backoff_base * (2 ** attempt)))
+
+
+def resilient_get(source: str, url: str, params: dict = None, session=None, sleep=time.sleep):
+    """
+    GETs url under the policy for `source` and returns the successful response.
+
+    Retries connection errors, timeouts and 429/5xx responses. Other HTTP errors
+    (such as 401 for a bad API key) are raised straight away, unretried.
+    Raises SourceUnavailableError when the breaker is open or the deadline/attempts run out.
+    """
+    import requests
+
+    policy = get_policy(source)
+    breaker = get_breaker(source)
+    metrics = get_source_metrics(source)
+    http = session or requests
+
+    if not breaker.allow():
+        metrics.record_short_circuit()
+        raise SourceUnavailableError(f"Circuit open for '{source}': failing fast without calling {url}.")
+
+    started = time.monotonic()
+    deadline = started + policy.deadline
+    attempts = 0
+    last_error = None
+
+    while attempts < policy.max_attempts:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        attempts += 1
+        retry_after = None
+        try:
+            response = http.get(
+                url,
+                params=params,
+                timeout=(min(policy.connect_timeout, remaining), min(policy.read_timeout, remaining)),
+            )
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                last_error = requests.exceptions.HTTPError(
+                    f"{response.status_code} from {source}", response=response
+                )
+            else:
+                response.raise_for_status()
+                breaker.record_success()
+                metrics.record_call(time.monotonic() - started, attempts, failed=False)
+                return response
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            last_error = e
+        except requests.exceptions.HTTPError:
+            # A non-retryable client error: the endpoint is up, the request is wrong.
+            metrics.record_call(time.monotonic() - started, attempts, failed=True)
+            raise
+
+        if attempts >= policy.max_attempts:
+            break
+        delay = backoff_delay(policy, attempts - 1)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if time.monotonic() + delay >= deadline:
+            # Waiting would overrun the deadline, so give up now rather than later.
+            break
+        sleep(delay)
+
+    breaker.record_failure()
+    metrics.record_call(time.monotonic() - started, attempts, failed=True)
+    raise SourceUnavailableError(
+        f"'{source}' unavailable after {attempts} attempt(s) in {time.monotonic() - started:.1f}s: {last_error}"
+    )
@@ -0,0 +1,210 @@
+import os
+import tempfile
+
+from .cities import city_names
+
+# --- Delivery Risk Snapshot ---
+# The dispatch system needs per-city, per-slot rain and wind risk in milliseconds,
+# which is too slow to get from the batch SQL in 'Risk Flag Analysis.sql'. After
+# each export the 'weather_forecasts' table is packed into NumPy arrays of shape
+# (city, 3-hour slot) and saved as one .npz file. The risk service keeps that file
+# in memory and answers queries by indexing the arrays.
+#
+# The flags follow the same daily rules as the SQL analysis, so a slot carries
+# the risk of its whole UTC day:
+#   rain risk: daily rainfall >= 5 mm, or rain in 3 or more 3-hour periods
+#   wind risk: daily maximum wind speed >= 10 m/s
+
+SLOT_HOURS = 3
+SLOTS_PER_DAY = 24 // SLOT_HOURS
+RAIN_RISK_DAILY_MM = 5.0
+RAIN_RISK_RAINY_PERIODS = 3
+WIND_RISK_MS = 10.0
+DEFAULT_SNAPSHOT_FILE = 'risk_snapshot.npz'
+
+
+def build_risk_snapshot(df, cities=None) -> dict:
+    """
+    Packs a 'weather_forecasts' DataFrame into arrays indexed by [city, slot].
+    Rows are ordered by city_id, and the names the service looks cities up by come
+    from the 'cities' table (default: the five CITIES).
+    Slot 0 starts at midnight UTC of the earliest forecast day. Slots with no
+    forecast are NaN in the value arrays and False in 'present'.
+    """
+    import numpy as np
+    import pandas as pd
+
+    city_ids = df['city_id'].to_numpy()
+    unique_ids = np.unique(city_ids)
+    city_index = np.searchsorted(unique_ids, city_ids)
+
+    times = pd.to_datetime(df['forecast_time']).to_numpy().astype('datetime64[s]')
+    start = times.min().astype('datetime64[D]').astype('datetime64[s]')
+    slot_index = ((times - start) // np.timedelta64(SLOT_HOURS, 'h')).astype(np.int64)
+    # Whole days only, so the daily flags can be computed with one reshape.
+    day_count = int(slot_index.max()) // SLOTS_PER_DAY + 1
+    shape = (len(unique_ids), day_count * SLOTS_PER_DAY)
+
+    arrays = {}
+    for name, column in [('temperature', 'temperature'), ('rainfall', 'rainfall_mm'), ('wind', 'wind_speed_ms')]:
+        values = np.full(shape, np.nan, dtype=np.float32)
+        values[city_index, slot_index] = df[column].to_numpy(dtype=np.float32)
+        arrays[name] = values
+
+    present = ~np.isnan(arrays['rainfall'])
+    by_day = (len(unique_ids), day_count, SLOTS_PER_DAY)
+    daily_rain = np.where(present, arrays['rainfall'], 0).reshape(by_day).sum(axis=2)
+    rainy_periods = (np.nan_to_num(arrays['rainfall']) > 0).reshape(by_day).sum(axis=2)
+    daily_max_wind = np.where(present, arrays['wind'], -np.inf).reshape(by_day).max(axis=2)
+
+    rain_risk = (daily_rain >= RAIN_RISK_DAILY_MM) | (rainy_periods >= RAIN_RISK_RAINY_PERIODS)
+    wind_risk = daily_max_wind >= WIND_RISK_MS
+
+    return {
+        'city_ids': unique_ids.astype(np.int32),
+        'cities': np.array(city_names(unique_ids, cities)),
+        'start': np.int64(start.astype(np.int64)),
+        'slot_hours': np.int64(SLOT_HOURS),
+        'present': present,
+        'rain_risk': np.repeat(rain_risk, SLOTS_PER_DAY, axis=1) & present,
+        'wind_risk': np.repeat(wind_risk, SLOTS_PER_DAY, axis=1) & present,
+        **arrays,
+    }
+
+
+def snapshot_to_frame(snapshot: dict):
+    """Unpacks a snapshot back into 'weather_forecasts' rows (used to merge incremental runs)."""
+    import numpy as np
+    import pandas as pd
+
+    city_index, slot_index = np.nonzero(snapshot['present'])
+    start = np.datetime64(int(snapshot['start']), 's')
+    slot = np.timedelta64(int(snapshot['slot_hours']), 'h')
+    return pd.DataFrame({
+        'city_id': snapshot['city_ids'][city_index],
+        'forecast_time': (start + slot_index * slot).astype('datetime64[ns]'),
+        'temperature': snapshot['temperature'][city_index, slot_index],
+        'rainfall_mm': snapshot['rainfall'][city_index, slot_index],
+        'wind_speed_ms': snapshot['wind'][city_index, slot_index],
+    })
+
+
+def load_risk_snapshot(path: str) -> dict:
+    import numpy as np
+
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def save_risk_snapshot(snapshot: dict, path: str) -> None:
+    """
+    Writes the snapshot to a temporary file next to `path` and renames it into place.
+    os.replace is atomic, so the risk service never reads a half-written file.
+    """
+    import numpy as np
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.npz.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **snapshot)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def write_risk_snapshot(df, path: str, merge: bool = False, cities=None) -> None:
+    """
+    Builds and atomically saves the snapshot for a 'weather_forecasts' DataFrame.
+    With merge=True (incremental runs, where df only holds the changed rows) the
+    rows are laid over the previous snapshot before the daily flags are recomputed.
+    Merged days that are already past (before today UTC, or before the first
+    day in df if that is earlier) are dropped, so the snapshot does not grow run after run.
+    """
+    import pandas as pd
+
+    if df is None or df.empty:
+        print("No weather rows to snapshot. Keeping the previous risk snapshot.")
+        return
+
+    previous = load_risk_snapshot(path) if merge and os.path.exists(path) else None
+    if previous is not None and 'city_ids' not in previous:
+        print("The previous risk snapshot predates city ids. Rebuilding it from this run's rows only.")
+    elif previous is not None:
+        today = pd.Timestamp.now(tz='UTC').tz_localize(None).normalize()
+        window_start = min(today, pd.to_datetime(df['forecast_time']).min().normalize())
+        df = pd.concat([snapshot_to_frame(previous), df], ignore_index=True)
+        df['forecast_time'] = pd.to_datetime(df['forecast_time'])
+        df = df.drop_duplicates(['city_id', 'forecast_time'], keep='last')
+        df = df[df['forecast_time'] >= window_start]
+
+    snapshot = build_risk_snapshot(df, cities)
+    save_risk_snapshot(snapshot, path)
+    print(f"Risk snapshot written to {path}: {snapshot['present'].shape[0]} cities x "
+          f"{snapshot['present'].shape[1]} slots.")
+
+
+def risk_snapshot_path(repo_path: str, **kwargs) -> str:
+    """
+    Resolves the snapshot file from the 'risk_snapshot' pipeline variable, or
+    defaults to 'risk_snapshot.npz' in 'state_dir'. Relative paths are resolved
+    against the Mage project folder.
+    """
+    path = kwargs.get('risk_snapshot') or os.path.join(kwargs.get('state_dir') or 'state', DEFAULT_SNAPSHOT_FILE)
+    return path if os.path.isabs(path) else os.path.join(repo_path, path)
+
+
+class RiskIndex:
+    """Answers point and range risk queries from a loaded snapshot."""
+
+    def __init__(self, snapshot: dict):
+        self.snapshot = snapshot
+        self.cities = [str(city) for city in snapshot['cities']]
+        self.city_ids = [int(city_id) for city_id in snapshot['city_ids']]
+        self.city_index = {city: i for i, city in enumerate(self.cities)}
+        self.start = int(snapshot['start'])
+        self.slot_seconds = int(snapshot['slot_hours']) * 3600
+        self.slot_count = snapshot['present'].shape[1]
+
+    def slot_for(self, epoch_seconds: int) -> int:
+        """The slot containing the given time, or -1 outside the forecast window."""
+        slot = (epoch_seconds - self.start) // self.slot_seconds
+        return slot if 0 <= slot < self.slot_count else -1
+
+    def _slot_record(self, city_index: int, slot: int) -> dict:
+        s = self.snapshot
+        return {
+            'city': self.cities[city_index],
+            'city_id': self.city_ids[city_index],
+            'slot_start': self.start + slot * self.slot_seconds,
+            'rain_risk': bool(s['rain_risk'][city_index, slot]),
+            'wind_risk': bool(s['wind_risk'][city_index, slot]),
+            'rainfall_mm': round(float(s['rainfall'][city_index, slot]), 2),
+            'wind_speed_ms': round(float(s['wind'][city_index, slot]), 2),
+            'temperature': round(float(s['temperature'][city_index, slot]), 2),
+        }
+
+    def point(self, city: str, epoch_seconds: int):
+        """Risk for one city at one time, or None when there is no forecast for it."""
+        city_index = self.city_index.get(city)
+        slot = self.slot_for(epoch_seconds)
+        if city_index is None or slot < 0 or not self.snapshot['present'][city_index, slot]:
+            return None
+        return self._slot_record(city_index, slot)
+
+    def range(self, start_seconds: int, end_seconds: int, city: str = None) -> list:
+        """Risk for every forecast slot overlapping [start, end), for one city or all of them."""
+        import numpy as np
+
+        first = max(0, (start_seconds - self.start) // self.slot_seconds)
+        last = min(self.slot_count, -(-(end_seconds - self.start) // self.slot_seconds))
+        if first >= last:
+            return []
+        city_indexes = [self.city_index[city]] if city else range(len(self.cities))
+        records = []
+        for city_index in city_indexes:
+            for slot in np.flatnonzero(self.snapshot['present'][city_index, first:last]) + first:
+                records.append(self._slot_record(city_index, int(slot)))
+        return records
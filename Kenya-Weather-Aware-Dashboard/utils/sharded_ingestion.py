@@ -0,0 +1,102 @@
+import glob
+import os
+
+from .cities import build_cities_table
+from .extract import fetch_weather_data
+from .transform import WEATHER_MEDIAN_COLUMNS, fill_weather_gaps, transform_weather_data
+
+# --- Sharded Weather Ingestion ---
+# For grids of thousands of locations, the location list is split into shards.
+# Each worker process fetches and transforms its own shard and writes a Parquet
+# partition to a staging folder; a final merge step stitches the partitions together.
+# Every shard maps city names with the same 'cities' table, so city_id values agree.
+# Missing readings are filled after the merge, from one set of cached medians, rather
+# than by each worker fitting its own.
+
+
+def partition_locations(locations: dict, shard_count: int) -> list:
+    """Splits a {name: coords} mapping into shard_count roughly equal shards, round-robin."""
+    shard_count = max(1, min(shard_count, len(locations)))
+    shards = [{} for _ in range(shard_count)]
+    for i, (name, coords) in enumerate(locations.items()):
+        shards[i % shard_count][name] = coords
+    return shards
+
+
+def ingest_shard(shard_index: int, locations: dict, api_key: str, staging_dir: str, cities=None) -> str:
+    """
+    Fetches and transforms one shard of locations and writes it as a Parquet partition.
+    Returns the partition path, or None when the shard produced no rows.
+    """
+    import requests
+
+    with requests.Session() as session:
+        weather_raw = fetch_weather_data(api_key, locations, session=session)
+
+    df = transform_weather_data(weather_raw, cities=cities, fill_missing=False)
+    if df.empty:
+        return None
+
+    partition_path = os.path.join(staging_dir, f'shard-{shard_index:05d}.parquet')
+    df.to_parquet(partition_path, index=False)
+    print(f"Shard {shard_index}: wrote {len(df)} rows for {len(locations)} locations.")
+    return partition_path
+
+
+def ingest_weather_sharded(locations: dict, api_key: str, staging_dir: str,
+                           shard_count: int = None, max_workers: int = None, cities=None) -> list:
+    """
+    Runs ingest_shard for every shard in a pool of worker processes.
+    Defaults to one shard and one worker per CPU core. Returns the partition paths.
+    Pass the run's `cities` table when ingesting only part of its locations.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if not api_key:
+        raise Exception("Error: OPENWEATHER_API_KEY not found. Please check your .env file setup in the Mage block.")
+
+    os.makedirs(staging_dir, exist_ok=True)
+    # Clear partitions left by an earlier run so the merge only sees this run's shards.
+    for old_partition in glob.glob(os.path.join(staging_dir, 'shard-*.parquet')):
+        os.remove(old_partition)
+
+    shard_count = shard_count or os.cpu_count() or 1
+    shards = partition_locations(locations, shard_count)
+    if cities is None:
+        cities = build_cities_table(locations)
+    print(f"Ingesting {len(locations)} locations in {len(shards)} shards...")
+
+    with ProcessPoolExecutor(max_workers=max_workers or len(shards)) as executor:
+        futures = [
+            executor.submit(ingest_shard, i, shard, api_key, staging_dir, cities)
+            for i, shard in enumerate(shards)
+        ]
+        partition_paths = [future.result() for future in futures]
+
+    return [p for p in partition_paths if p]
+
+
+def merge_shards(partition_paths: list, saved=None, cities=None, stats_path: str = None):
+    """
+    Combines the shard partitions into one 'weather_forecasts' DataFrame.
+    `saved` holds rows kept from an earlier attempt of the run, merged in as well.
+    The per-shard forecast_id values overlap, so they are re-assigned after sorting.
+    Missing readings are filled from the medians in stats_path, fitting any city they lack.
+    """
+    import pandas as pd
+
+    frames = ([] if saved is None else [saved]) + [pd.read_parquet(p) for p in partition_paths]
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True)
+    df = df.sort_values(['city_id', 'forecast_time'], ignore_index=True)
+    df['forecast_id'] = range(1, 1 + len(df))
+
+    if cities is None:
+        cities = build_cities_table()
+    names = cities.set_index('city_id')['city_name'].reindex(df['city_id']).to_numpy()
+    filled = fill_weather_gaps(df[WEATHER_MEDIAN_COLUMNS].assign(city_name=names), stats_path=stats_path)
+    df[WEATHER_MEDIAN_COLUMNS] = filled[WEATHER_MEDIAN_COLUMNS]
+    print(f"Merged {len(partition_paths)} shards into {len(df)} weather rows.")
+    return df
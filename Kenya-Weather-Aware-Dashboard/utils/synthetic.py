@@ -0,0 +1,290 @@
+import io
+import os
+from datetime import datetime, timedelta
+
+from .cities import build_cities_table
+from .extract import CITIES
+from .risk_snapshot import RAIN_RISK_DAILY_MM, RAIN_RISK_RAINY_PERIODS, SLOTS_PER_DAY
+
+# --- Synthetic Star Schema for Load Testing ---
+# Generates customers, products, orders, weather_forecasts and the cities dimension
+# offline, at a scale factor in the style of TPC-H: scale factor 1 is one million
+# orders. Every chunk is generated independently from its own seeded random stream,
+# so chunks run in parallel worker processes and the output does not depend on the
+# worker count.
+#
+# Referential integrity holds by construction: order keys are drawn from the
+# known customer and product id ranges, and a customer's city is a pure function
+# of its id, so order chunks never need the customers table in memory.
+
+ROWS_PER_SCALE_FACTOR = {'customers': 100_000, 'products': 2_000, 'orders': 1_000_000}
+DEFAULT_CHUNK_ROWS = 1_000_000
+ORDER_WINDOW_DAYS = 90
+FORECAST_DAYS = 5
+
+# Share of customers (and so of order volume) per city, roughly by urban population.
+CITY_WEIGHTS = {'Nairobi': 0.42, 'Mombasa': 0.20, 'Kisumu': 0.14, 'Nakuru': 0.13, 'Eldoret': 0.11}
+# (mean temperature C, chance of rain per 3-hour slot, mean wind m/s) per city.
+CITY_CLIMATE = {
+    'Nairobi': (19.0, 0.18, 4.0),
+    'Mombasa': (27.5, 0.15, 6.5),
+    'Kisumu': (24.0, 0.28, 3.5),
+    'Nakuru': (18.5, 0.20, 3.8),
+    'Eldoret': (16.5, 0.24, 4.2),
+}
+CITY_NAMES = list(CITIES)
+
+DELIVERY_STATUSES = ['Delivered', 'Shipped', 'On Time', 'Delayed', 'Cancelled']
+# Orders placed on rain-risk days are delayed and cancelled more often.
+STATUS_WEIGHTS_CLEAR = [0.45, 0.15, 0.22, 0.11, 0.07]
+STATUS_WEIGHTS_RISKY = [0.33, 0.12, 0.14, 0.29, 0.12]
+
+CATEGORIES = ["men's clothing", "women's clothing", 'jewelery', 'electronics']
+CATEGORY_WEIGHTS = [0.3, 0.3, 0.15, 0.25]
+FIRST_NAMES = ['Wanjiru', 'Otieno', 'Achieng', 'Kamau', 'Njeri', 'Mwangi', 'Akinyi', 'Kiprono',
+               'Chebet', 'Omondi', 'Wambui', 'Mutua', 'Nafula', 'Kipchoge', 'Atieno', 'Njoroge']
+LAST_NAMES = ['Kariuki', 'Ochieng', 'Mutai', 'Wafula', 'Kimani', 'Odhiambo', 'Rotich', 'Mugo',
+              'Barasa', 'Chege', 'Koech', 'Onyango', 'Maina', 'Kiplagat', 'Wekesa', 'Ndungu']
+
+# 'cities' goes last so the per-table random streams (and so the data) stay the same.
+TABLES = ['customers', 'products', 'orders', 'weather_forecasts', 'cities']
+TABLE_CODES = {name: i for i, name in enumerate(TABLES)}
+
+POSTGRES_DDL = {
+    'customers': 'customer_id BIGINT, first_name TEXT, last_name TEXT, email TEXT, city_id INTEGER',
+    'products': 'product_id BIGINT, name TEXT, price DOUBLE PRECISION, category TEXT',
+    'orders': 'order_id BIGINT, customer_id BIGINT, product_id BIGINT, order_date TIMESTAMP, '
+              'quantity INTEGER, delivery_status TEXT',
+    'weather_forecasts': 'forecast_id BIGINT, city_id INTEGER, forecast_time TIMESTAMP, '
+                         'temperature DOUBLE PRECISION, rainfall_mm DOUBLE PRECISION, wind_speed_ms DOUBLE PRECISION',
+    'cities': 'city_id INTEGER, city_name TEXT, latitude DOUBLE PRECISION, longitude DOUBLE PRECISION',
+}
+
+
+def scale_counts(scale_factor: float) -> dict:
+    """Rows per table for a scale factor (products never drop below the 20 of the Fake Store API)."""
+    counts = {table: int(rows * scale_factor) for table, rows in ROWS_PER_SCALE_FACTOR.items()}
+    counts['products'] = max(20, counts['products'])
+    counts['customers'] = max(50, counts['customers'])
+    return counts
+
+
+def _rng(seed: int, table: str, chunk_index: int):
+    import numpy as np
+    return np.random.default_rng([seed, TABLE_CODES[table], chunk_index])
+
+
+def customer_city_codes(customer_ids):
+    """
+    Maps customer ids to indexes into CITY_NAMES in proportion to CITY_WEIGHTS.
+    Uses the golden-ratio sequence, so any range of ids gets the exact city mix.
+    """
+    import numpy as np
+
+    cumulative = np.cumsum([CITY_WEIGHTS[city] for city in CITY_NAMES])
+    fraction = (np.asarray(customer_ids, dtype=np.float64) * 0.6180339887498949) % 1.0
+    return np.minimum(np.searchsorted(cumulative, fraction, side='right'), len(CITY_NAMES) - 1)
+
+
+def generate_customers(start_id: int, count: int, seed: int):
+    import numpy as np
+    import pandas as pd
+
+    rng = _rng(seed, 'customers', start_id)
+    ids = np.arange(start_id, start_id + count, dtype=np.int64)
+    first = np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), count)]
+    last = np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), count)]
+    email = (pd.Series(first).str.lower() + '.' + pd.Series(last).str.lower()
+             + pd.Series(ids).astype(str) + '@example.co.ke')
+    return pd.DataFrame({
+        'customer_id': ids,
+        'first_name': first,
+        'last_name': last,
+        'email': email,
+        'city_id': build_cities_table()['city_id'].to_numpy()[customer_city_codes(ids)],
+    })
+
+
+def generate_products(start_id: int, count: int, seed: int):
+    import numpy as np
+    import pandas as pd
+
+    rng = _rng(seed, 'products', start_id)
+    ids = np.arange(start_id, start_id + count, dtype=np.int64)
+    return pd.DataFrame({
+        'product_id': ids,
+        'name': 'Product ' + pd.Series(ids).astype(str),
+        'price': rng.lognormal(3.3, 0.9, count).round(2),
+        'category': np.array(CATEGORIES)[rng.choice(len(CATEGORIES), count, p=CATEGORY_WEIGHTS)],
+    })
+
+
+def generate_weather(window_start: datetime, seed: int):
+    """Three-hourly weather for every city over the order window plus the forecast horizon."""
+    import numpy as np
+    import pandas as pd
+
+    rng = _rng(seed, 'weather_forecasts', 0)
+    times = pd.date_range(window_start, periods=(ORDER_WINDOW_DAYS + FORECAST_DAYS) * SLOTS_PER_DAY, freq='3h')
+    frames = []
+    for city, city_id in zip(CITY_NAMES, build_cities_table()['city_id']):
+        mean_temp, rain_chance, mean_wind = CITY_CLIMATE[city]
+        n = len(times)
+        diurnal = 4 * np.sin((times.hour.to_numpy() - 9) / 24 * 2 * np.pi)
+        rainy = rng.random(n) < rain_chance
+        frames.append(pd.DataFrame({
+            'city_id': np.full(n, city_id, dtype=np.int32),
+            'forecast_time': times,
+            'temperature': (mean_temp + diurnal + rng.normal(0, 1.5, n)).round(2),
+            'rainfall_mm': np.where(rainy, rng.gamma(1.2, 1.8, n), 0.0).round(2),
+            'wind_speed_ms': rng.gamma(4, mean_wind / 4, n).round(2),
+        }))
+    df = pd.concat(frames, ignore_index=True)
+    df.insert(0, 'forecast_id', np.arange(1, 1 + len(df), dtype=np.int64))
+    return df
+
+
+def daily_rain_risk(weather_df):
+    """[city, day] booleans using the rain rule of 'Risk Flag Analysis.sql'."""
+    import numpy as np
+
+    rain = weather_df['rainfall_mm'].to_numpy().reshape(len(CITY_NAMES), -1, SLOTS_PER_DAY)
+    return (rain.sum(axis=2) >= RAIN_RISK_DAILY_MM) | ((rain > 0).sum(axis=2) >= RAIN_RISK_RAINY_PERIODS)
+
+
+def generate_orders(start_id: int, count: int, counts: dict, rain_risk, window_start: datetime, seed: int):
+    """
+    Orders whose keys always point at existing customers and products.
+    A few customers and products account for most orders, as in real sales data.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = _rng(seed, 'orders', start_id)
+    # Power-law skew: low ids are picked far more often than high ones.
+    customer_ids = 1 + (counts['customers'] * rng.random(count) ** 2.5).astype(np.int64)
+    product_ids = 1 + (counts['products'] * rng.random(count) ** 3).astype(np.int64)
+    offsets = rng.integers(0, ORDER_WINDOW_DAYS * 86400, count)
+    order_date = np.datetime64(window_start, 's') + offsets.astype('timedelta64[s]')
+
+    risky = rain_risk[customer_city_codes(customer_ids), offsets // 86400]
+    draws = rng.random(count)
+    status_codes = np.where(
+        risky,
+        np.searchsorted(np.cumsum(STATUS_WEIGHTS_RISKY), draws, side='right'),
+        np.searchsorted(np.cumsum(STATUS_WEIGHTS_CLEAR), draws, side='right'),
+    )
+    return pd.DataFrame({
+        'order_id': np.arange(start_id, start_id + count, dtype=np.int64),
+        'customer_id': customer_ids,
+        'product_id': product_ids,
+        'order_date': order_date.astype('datetime64[ns]'),
+        'quantity': rng.integers(1, 6, count),
+        'delivery_status': np.array(DELIVERY_STATUSES)[np.minimum(status_codes, len(DELIVERY_STATUSES) - 1)],
+    })
+
+
+def chunk_ranges(total: int, chunk_rows: int) -> list:
+    """(start_id, count) pairs covering ids 1..total."""
+    return [(start, min(chunk_rows, total - start + 1)) for start in range(1, total + 1, chunk_rows)]
+
+
+# --- Sinks ---
+
+def write_parquet_chunk(df, out_dir: str, table: str, chunk_index: int) -> str:
+    table_dir = os.path.join(out_dir, table)
+    os.makedirs(table_dir, exist_ok=True)
+    path = os.path.join(table_dir, f'part-{chunk_index:05d}.parquet')
+    df.to_parquet(path, index=False)
+    return path
+
+
+def copy_chunk_to_postgres(df, dsn: str, table: str) -> None:
+    """Streams one chunk into PostgreSQL with COPY ... FROM STDIN, on its own connection."""
+    import psycopg2
+
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    with psycopg2.connect(dsn) as conn, conn.cursor() as cursor:
+        cursor.copy_expert(f'COPY {table} ({", ".join(df.columns)}) FROM STDIN WITH (FORMAT csv)', buffer)
+
+
+def create_postgres_tables(dsn: str) -> None:
+    """Drops and re-creates the tables, without indexes, so COPY runs at full speed."""
+    import psycopg2
+
+    with psycopg2.connect(dsn) as conn, conn.cursor() as cursor:
+        for table in TABLES:
+            cursor.execute(f'DROP TABLE IF EXISTS {table} CASCADE')
+            cursor.execute(f'CREATE TABLE {table} ({POSTGRES_DDL[table]})')
+
+
+def _generate_chunk(table: str, chunk_index: int, start_id: int, count: int, settings: dict) -> int:
+    """Worker entry point: builds one chunk and sends it to the chosen sink. Returns its row count."""
+    seed = settings['seed']
+    if table == 'customers':
+        df = generate_customers(start_id, count, seed)
+    elif table == 'products':
+        df = generate_products(start_id, count, seed)
+    else:
+        df = generate_orders(start_id, count, settings['counts'], settings['rain_risk'],
+                             settings['window_start'], seed)
+
+    if settings['sink'] == 'parquet':
+        write_parquet_chunk(df, settings['target'], table, chunk_index)
+    else:
+        copy_chunk_to_postgres(df, settings['target'], table)
+    return len(df)
+
+
+def generate_star_schema(scale_factor: float, sink: str, target: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                         max_workers: int = None, seed: int = 42, end_date: datetime = None) -> dict:
+    """
+    Generates every table at the given scale factor and returns their row counts.
+    sink is 'parquet' (target is an output folder, one sub-folder of part files per
+    table) or 'postgres' (target is a connection string; tables are re-created).
+    Orders fall in the ORDER_WINDOW_DAYS before end_date (default: today, midnight).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if sink not in ('parquet', 'postgres'):
+        raise ValueError(f"Unknown sink '{sink}'. Expected 'parquet' or 'postgres'.")
+
+    end_date = end_date or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    window_start = end_date - timedelta(days=ORDER_WINDOW_DAYS)
+    counts = scale_counts(scale_factor)
+
+    if sink == 'parquet':
+        import glob
+        for old_part in glob.glob(os.path.join(target, '*', 'part-*.parquet')):
+            os.remove(old_part)
+    else:
+        create_postgres_tables(target)
+
+    # The cities dimension and weather are small (five cities over the window), and
+    # orders depend on the weather, so both are built first.
+    cities = build_cities_table()
+    weather = generate_weather(window_start, seed)
+    for table, df in [('cities', cities), ('weather_forecasts', weather)]:
+        if sink == 'parquet':
+            write_parquet_chunk(df, target, table, 0)
+        else:
+            copy_chunk_to_postgres(df, target, table)
+
+    settings = {'seed': seed, 'sink': sink, 'target': target, 'counts': counts,
+                'rain_risk': daily_rain_risk(weather), 'window_start': window_start}
+    jobs = [
+        (table, chunk_index, start_id, count)
+        for table in ['customers', 'products', 'orders']
+        for chunk_index, (start_id, count) in enumerate(chunk_ranges(counts[table], chunk_rows))
+    ]
+    print(f"Generating {counts['orders']:,} orders, {counts['customers']:,} customers and "
+          f"{counts['products']:,} products in {len(jobs)} chunks...")
+
+    rows = {'cities': len(cities), 'weather_forecasts': len(weather), 'customers': 0, 'products': 0, 'orders': 0}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_generate_chunk, *job, settings): job[0] for job in jobs}
+        for future, table in futures.items():
+            rows[table] += future.result()
+    return rows
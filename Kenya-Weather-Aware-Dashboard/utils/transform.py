@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from .cities import build_cities_table, to_city_ids
+from .imputation import fill_missing_values_with_median, get_median_stats
+
+# --- Helper Transformation Functions ---
+# Shared by the monolithic 'data_processing' block and the per-source transformers.
+# pandas is imported inside each function so importing a block stays cheap.
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def extract_nested_value(df: pd.DataFrame, column: str, key: str) -> pd.Series:
+    """Reads a key from a column of nested dicts, yielding NaN where the dict or key is missing."""
+    import pandas as pd
+
+    if column not in df:
+        return pd.Series(float('nan'), index=df.index)
+    return pd.to_numeric(df[column].astype(object).str.get(key), errors='coerce')
+
+WEATHER_MEDIAN_COLUMNS = ['temperature', 'wind_speed_ms']
+
+def fill_weather_gaps(df: pd.DataFrame, refit_medians: bool = False, stats_path: str = None) -> pd.DataFrame:
+    """
+    Fills missing temperature and wind speed readings of a frame with a 'city_name'
+    column with the city's median, fitted once and reused by later runs (kept in stats_path when given).
+    """
+    stats = get_median_stats(df, 'weather_forecasts', columns=WEATHER_MEDIAN_COLUMNS,
+                             by='city_name', refit=refit_medians, stats_path=stats_path)
+    return fill_missing_values_with_median(df, stats, columns=WEATHER_MEDIAN_COLUMNS, by='city_name')
+
+def transform_weather_data(weather_data_raw: list, refit_medians: bool = False, cities: pd.DataFrame = None,
+                           stats_path: str = None, fill_missing: bool = True) -> pd.DataFrame:
+    """
+    Cleans and transforms raw weather data.
+    Missing temperature and wind speed readings are filled by fill_weather_gaps,
+    unless fill_missing is False (the sharded grid fills them once, after the merge).
+    City names are replaced by their city_id from `cities` (default: the five CITIES).
+    """
+    import pandas as pd
+
+    if not weather_data_raw:
+        return pd.DataFrame()
+    df = pd.DataFrame(weather_data_raw)
+    # Cast explicitly: the 'weather_forecasts' contract expects float columns even
+    # when every value in a batch is missing or a whole number.
+    df['temperature'] = extract_nested_value(df, 'main', 'temp').astype('float64')
+    df['wind_speed_ms'] = extract_nested_value(df, 'wind', 'speed').astype('float64')
+    # The 'rain' key is omitted entirely when no rain is forecast, so a missing value means 0 mm.
+    df['rainfall_mm'] = extract_nested_value(df, 'rain', '3h').fillna(0.0).astype('float64')
+    df['forecast_time'] = pd.to_datetime(df['dt_txt'])
+    df_transformed = df[['city', 'forecast_time', 'temperature', 'rainfall_mm', 'wind_speed_ms']].copy()
+    df_transformed.rename(columns={'city': 'city_name'}, inplace=True)
+
+    if fill_missing:
+        df_transformed = fill_weather_gaps(df_transformed, refit_medians=refit_medians, stats_path=stats_path)
+    df_transformed.insert(0, 'city_id', to_city_ids(df_transformed.pop('city_name'), cities))
+    df_transformed.insert(0, 'forecast_id', range(1, 1 + len(df_transformed)))
+    print("Weather data transformed successfully.")
+    return df_transformed
+
+def transform_product_data(product_data_raw: list) -> pd.DataFrame:
+    """Cleans and transforms raw product data."""
+    import pandas as pd
+
+    if not product_data_raw:
+        return pd.DataFrame()
+    df = pd.DataFrame(product_data_raw)
+    df_transformed = df[['id', 'title', 'price', 'category']].copy()
+    df_transformed.rename(columns={'id': 'product_id', 'title': 'name'}, inplace=True)
+    # The 'products' contract expects a float price, even when every price in a batch is whole.
+    df_transformed['price'] = df_transformed['price'].astype('float64')
+    print("Product data transformed successfully.")
+    return df_transformed
+
+def transform_customer_data(customer_data_raw: list) -> pd.DataFrame:
+    """Cleans and transforms raw customer data, assigning Kenyan cities by city_id."""
+    import numpy as np
+    import pandas as pd
+
+    if not customer_data_raw:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(customer_data_raw)
+    
+    # The ids of the five Kenyan cities in the 'cities' table.
+    kenyan_city_ids = build_cities_table()['city_id'].to_numpy()
+    
+    # Randomly assign one of the cities to every row in a single vectorized draw.
+    # This OVERWRITES the fake city data that came from the API.
+    df['city_id'] = np.random.default_rng().choice(kenyan_city_ids, size=len(df))
+
+    # The rest of the function remains the same.
+    df_transformed = df[['id', 'firstname', 'lastname', 'email', 'city_id']].copy()
+    df_transformed.rename(columns={'id': 'customer_id', 'firstname': 'first_name', 'lastname': 'last_name'}, inplace=True)
+    
+    print("Customer data transformed successfully with Kenyan cities.")
+    return df_transformed
+
+def generate_mock_orders(customers_df: pd.DataFrame, products_df: pd.DataFrame, num_orders: int = 200) -> pd.DataFrame:
+    """Generates a DataFrame of mock orders."""
+    import pandas as pd
+
+    if customers_df.empty or products_df.empty:
+        return pd.DataFrame()
+
+    orders_data = []
+    customer_ids = customers_df['customer_id'].tolist()
+    product_ids = products_df['product_id'].tolist()
+    delivery_statuses = ['Delivered', 'Shipped', 'On Time', 'Delayed', 'Cancelled']
+    # Whole seconds only: sub-second order dates break the 'orders' contract and
+    # make the warehouse store (and compare) needlessly precise timestamps.
+    now = datetime.now().replace(microsecond=0)
+    
+    for i in range(1, num_orders + 1):
+        orders_data.append({
+            'order_id': i,
+            'customer_id': random.choice(customer_ids),
+            'product_id': random.choice(product_ids),
+            'order_date': now - timedelta(days=random.randint(0, 90)),
+            'quantity': random.randint(1, 5),
+            'delivery_status': random.choice(delivery_statuses)
+        })
+        
+    print(f"{num_orders} mock orders generated successfully.")
+    return pd.DataFrame(orders_data)
@@ -0,0 +1,271 @@
+import os
+
+# --- Warehouse Sinks ---
+# The pipeline can load its output tables into PostgreSQL (the default) or into
+# an embedded DuckDB file for field offices that cannot run a database server.
+# The sink is picked with the 'warehouse_sink' pipeline variable or the
+# WAREHOUSE_SINK environment variable.
+
+POSTGRES_SINK = 'postgres'
+DUCKDB_SINK = 'duckdb'
+BOTH_SINKS = 'both'
+SINKS = (POSTGRES_SINK, DUCKDB_SINK, BOTH_SINKS)
+
+DEFAULT_DUCKDB_DATABASE = 'kenya_weather_dashboard.duckdb'
+
+# The four dashboard analyses shipped in the root of the repository.
+ANALYSIS_FILES = [
+    'Daily Rainfall.sql',
+    'On time Delivery Rates.sql',
+    'Risk Flag Analysis.sql',
+    'Total Daily Orders by City.sql',
+]
+
+
+def resolve_sink(**kwargs) -> str:
+    """Returns the configured sink, preferring the pipeline variable over the environment."""
+    sink = (kwargs.get('warehouse_sink') or os.getenv('WAREHOUSE_SINK') or POSTGRES_SINK).lower()
+    if sink not in SINKS:
+        raise ValueError(f"Unknown warehouse sink '{sink}'. Expected one of: {', '.join(SINKS)}.")
+    return sink
+
+
+def sink_enabled(sink_name: str, **kwargs) -> bool:
+    """True when the given sink should receive this run's tables."""
+    sink = resolve_sink(**kwargs)
+    return sink == sink_name or sink == BOTH_SINKS
+
+
+def _repo_path() -> str:
+    from mage_ai.settings.repo import get_repo_path
+    return get_repo_path()
+
+
+def _io_config(profile: str = 'default'):
+    from mage_ai.io.config import ConfigFileLoader
+    return ConfigFileLoader(os.path.join(_repo_path(), 'io_config.yaml'), profile)
+
+
+def duckdb_paths(**kwargs) -> tuple:
+    """
+    Returns (database, parquet_dir) for the DuckDB sink.
+    The database file comes from 'DUCKDB_DATABASE' in 'io_config.yaml' and the
+    optional Parquet folder from the 'parquet_dir' pipeline variable.
+    Relative paths are resolved against the Mage project folder.
+    """
+    from mage_ai.io.config import ConfigKey
+
+    database = _io_config().get(ConfigKey.DUCKDB_DATABASE) or DEFAULT_DUCKDB_DATABASE
+    if not os.path.isabs(database):
+        database = os.path.join(_repo_path(), database)
+
+    parquet_dir = kwargs.get('parquet_dir')
+    if parquet_dir and not os.path.isabs(parquet_dir):
+        parquet_dir = os.path.join(_repo_path(), parquet_dir)
+    return database, parquet_dir
+
+
+def export_to_postgres(tables: dict) -> None:
+    """
+    Exports a dictionary of DataFrames to PostgreSQL using Mage's native connector.
+    Each table is dropped and re-created so its schema always matches the DataFrame.
+    """
+    from mage_ai.io.postgres import Postgres
+    from pandas import DataFrame
+
+    for table_name, df in tables.items():
+        if df is not None and isinstance(df, DataFrame) and not df.empty:
+            print(f"Preparing to export data to table: {table_name}")
+            with Postgres.with_config(_io_config()) as loader:
+                # 'DROP TABLE IF EXISTS' only drops the table if it's there,
+                # so the fresh export below never collides with an old schema.
+                print(f"Dropping table '{table_name}' if it exists...")
+                loader.execute(f'DROP TABLE IF EXISTS {table_name} CASCADE;')
+                print(f"Table '{table_name}' dropped.")
+
+                print(f"Exporting data to new '{table_name}' table...")
+                loader.export(
+                    df,
+                    None,  # schema_name
+                    table_name,
+                    index=False,
+                    if_exists='append',
+                )
+                print(f"Successfully exported data to table: {table_name}")
+        else:
+            print(f"Skipping table '{table_name}' as no data was provided.")
+
+
+def export_to_sink(sink_name: str, tables: dict, checkpoint=None, **kwargs) -> None:
+    """
+    Loads a dictionary of DataFrames into one sink, one table at a time.
+    With a run checkpoint (see utils/checkpoints.py), tables this run already loaded
+    into the sink are skipped and each newly loaded table is marked as done.
+    """
+    for table_name, df in tables.items():
+        if checkpoint and checkpoint.is_loaded(table_name, sink_name):
+            print(f"'{table_name}' was already loaded into {sink_name} in run {checkpoint.run_id}. Skipping.")
+            continue
+        if sink_name == POSTGRES_SINK:
+            export_to_postgres({table_name: df})
+        else:
+            database, parquet_dir = duckdb_paths(**kwargs)
+            export_to_duckdb({table_name: df}, database, parquet_dir=parquet_dir)
+        if checkpoint and df is not None and not df.empty:
+            checkpoint.mark_loaded(table_name, sink_name)
+
+
+def export_tables(tables: dict, checkpoint=None, **kwargs) -> None:
+    """Sends a dictionary of DataFrames to every sink selected for this run."""
+    for sink_name in (POSTGRES_SINK, DUCKDB_SINK):
+        if sink_enabled(sink_name, **kwargs):
+            export_to_sink(sink_name, tables, checkpoint=checkpoint, **kwargs)
+
+
+def _upsert_statements(table_name: str, staging_name: str, columns: list,
+                       key_columns: list, id_column: str = None) -> list:
+    """
+    SQL shared by both sinks to upsert a staging table into table_name.
+    Rows matching on key_columns are replaced. When id_column is given, the new rows
+    get ids continuing from the table's current maximum so the surrogate key stays unique.
+    """
+    key_match = ' AND '.join(f't.{col} = s.{col}' for col in key_columns)
+    value_columns = [col for col in columns if col != id_column]
+    select_columns = ', '.join(f's.{col}' for col in value_columns)
+    if id_column:
+        order = ', '.join(f's.{col}' for col in key_columns)
+        select_columns = (
+            f'(SELECT COALESCE(MAX({id_column}), 0) FROM {table_name}) '
+            f'+ ROW_NUMBER() OVER (ORDER BY {order}), {select_columns}'
+        )
+        insert_columns = ', '.join([id_column] + value_columns)
+    else:
+        insert_columns = ', '.join(value_columns)
+
+    return [
+        f'CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM {staging_name} WHERE 1 = 0',
+        f'DELETE FROM {table_name} t USING {staging_name} s WHERE {key_match}',
+        f'INSERT INTO {table_name} ({insert_columns}) SELECT {select_columns} FROM {staging_name} s',
+    ]
+
+
+def upsert_to_postgres(table_name: str, df, key_columns: list, id_column: str = None) -> None:
+    """Upserts df into a PostgreSQL table through a staging table, in one transaction."""
+    from mage_ai.io.postgres import Postgres
+
+    staging_name = f'{table_name}_changes'
+    with Postgres.with_config(_io_config()) as loader:
+        loader.execute(f'DROP TABLE IF EXISTS {staging_name};')
+        loader.export(df, None, staging_name, index=False, if_exists='append')
+        for statement in _upsert_statements(table_name, staging_name, list(df.columns), key_columns, id_column):
+            loader.execute(statement)
+        loader.execute(f'DROP TABLE {staging_name};')
+        loader.conn.commit()
+    print(f"Upserted {len(df)} rows into '{table_name}'.")
+
+
+def upsert_to_duckdb(table_name: str, df, key_columns: list, database: str, id_column: str = None) -> None:
+    """Upserts df into a DuckDB table, reading it through Arrow."""
+    import pyarrow as pa
+
+    with _connect_duckdb(database) as con:
+        con.register('s', pa.Table.from_pandas(df, preserve_index=False))
+        con.execute('BEGIN TRANSACTION')
+        for statement in _upsert_statements(table_name, 's', list(df.columns), key_columns, id_column):
+            con.execute(statement)
+        con.execute('COMMIT')
+        con.unregister('s')
+    print(f"Upserted {len(df)} rows into DuckDB table '{table_name}'.")
+
+
+def upsert_table(table_name: str, df, key_columns: list, id_column: str = None,
+                 checkpoint=None, **kwargs) -> None:
+    """
+    Upserts only the given rows into every selected sink, leaving other rows in place.
+    Like export_to_sink, sinks already marked as loaded in the run checkpoint are skipped.
+    """
+    if df is None or df.empty:
+        print(f"No changed rows for '{table_name}'. Nothing to export.")
+        return
+    for sink_name in (POSTGRES_SINK, DUCKDB_SINK):
+        if not sink_enabled(sink_name, **kwargs):
+            continue
+        if checkpoint and checkpoint.is_loaded(table_name, sink_name):
+            print(f"'{table_name}' was already upserted into {sink_name} in run {checkpoint.run_id}. Skipping.")
+            continue
+        if sink_name == POSTGRES_SINK:
+            upsert_to_postgres(table_name, df, key_columns, id_column=id_column)
+        else:
+            database, _ = duckdb_paths(**kwargs)
+            upsert_to_duckdb(table_name, df, key_columns, database, id_column=id_column)
+        if checkpoint:
+            checkpoint.mark_loaded(table_name, sink_name)
+
+
+def export_to_duckdb(tables: dict, database: str, parquet_dir: str = None) -> None:
+    """
+    Loads a dictionary of DataFrames into a DuckDB database file.
+
+    Each DataFrame is handed to DuckDB as an Arrow table, so numeric columns are
+    scanned in place instead of being copied row by row. When parquet_dir is set,
+    every table is also written out as a columnar Parquet file.
+    """
+    import duckdb
+    import pyarrow as pa
+    from pandas import DataFrame
+
+    if parquet_dir:
+        os.makedirs(parquet_dir, exist_ok=True)
+
+    with _connect_duckdb(database) as con:
+        for table_name, df in tables.items():
+            if df is None or not isinstance(df, DataFrame) or df.empty:
+                print(f"Skipping table '{table_name}' as no data was provided.")
+                continue
+
+            print(f"Loading data into DuckDB table '{table_name}'...")
+            arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+            con.register('staging_arrow', arrow_table)
+            con.execute(f'CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM staging_arrow')
+            con.unregister('staging_arrow')
+
+            if parquet_dir:
+                parquet_path = os.path.join(parquet_dir, f'{table_name}.parquet')
+                con.execute(f"COPY {table_name} TO '{parquet_path}' (FORMAT PARQUET)")
+            print(f"Successfully loaded '{table_name}' ({len(df)} rows).")
+
+
+def _connect_duckdb(database: str, attempts: int = 30, wait_seconds: float = 1.0):
+    """
+    Opens a DuckDB database for writing.
+    DuckDB allows one writer process per file, so when the per-table exporters run
+    in parallel processes the connection is retried until the file lock frees up.
+    """
+    import time
+    import duckdb
+
+    for attempt in range(1, attempts + 1):
+        try:
+            return duckdb.connect(database)
+        except duckdb.IOException:
+            if attempt == attempts:
+                raise
+            time.sleep(wait_seconds)
+
+
+def run_sql_file(con, sql_path: str):
+    """Runs one analysis file against an open DuckDB connection and returns a DataFrame."""
+    with open(sql_path, encoding='utf-8') as f:
+        query = f.read()
+    return con.execute(query).df()
+
+
+def run_analyses(database: str, sql_dir: str, files: list = None) -> dict:
+    """Runs the dashboard analyses against a DuckDB database, keyed by file name."""
+    import duckdb
+
+    results = {}
+    with duckdb.connect(database, read_only=True) as con:
+        for file_name in files or ANALYSIS_FILES:
+            results[file_name] = run_sql_file(con, os.path.join(sql_dir, file_name))
+    return results
@@ -1,8 +1,9 @@
 SELECT
-    c.city,
+    ci.city_name AS city,
     DATE(o.order_date) AS order_day,
     COUNT(o.order_id) AS total_orders
 FROM orders o
 JOIN customers c ON o.customer_id = c.customer_id
-GROUP BY c.city, order_day
-ORDER BY order_day, c.city;
\ No newline at end of file
+JOIN cities ci ON c.city_id = ci.city_id
+GROUP BY ci.city_name, order_day
+ORDER BY order_day, ci.city_name;
\ No newline at end of file
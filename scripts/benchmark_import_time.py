@@ -0,0 +1,121 @@
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+# --- Import-Time Benchmark ---
+# Measures the cold-start cost of importing each Mage block (and the standalone
+# scripts) with `python -X importtime`. Every sample runs in a fresh interpreter.
+# Results can be appended to a JSON history file to track regressions over time.
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAGE_PROJECT = os.path.join(REPO_ROOT, "Kenya-Weather-Aware-Dashboard")
+BLOCK_FOLDERS = ["data_loaders", "transformers", "data_exporters"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def discover_targets():
+    """Returns (label, working directory, module name) for every block and script."""
+    targets = []
+    for folder in BLOCK_FOLDERS:
+        for path in sorted(glob.glob(os.path.join(MAGE_PROJECT, folder, "*.py"))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name != "__init__":
+                targets.append((f"{folder}/{name}", MAGE_PROJECT, f"{folder}.{name}"))
+    for script in ["data_extraction", "data_processing"]:
+        targets.append((f"scripts/{script}", os.path.join(REPO_ROOT, "scripts"), script))
+    return targets
+
+
+def parse_importtime(stderr: str, module: str):
+    """
+    Returns (cumulative microseconds for module, {direct import: cumulative us}).
+    -X importtime prints each import after its children, indented one level
+    deeper, so the module's direct imports are the lines just above it.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((len(match.group(3)), match.group(4), int(match.group(2))))
+
+    for index, (depth, name, cumulative) in enumerate(entries):
+        if name != module:
+            continue
+        direct_imports = {}
+        for child_depth, child_name, child_cumulative in reversed(entries[:index]):
+            if child_depth <= depth:
+                break
+            if child_depth == depth + 2:
+                direct_imports[child_name] = child_cumulative
+        return cumulative, direct_imports
+    return None, {}
+
+
+def measure(cwd: str, module: str, repeat: int):
+    """Imports module in `repeat` fresh interpreters and returns the median and its direct imports."""
+    samples = []
+    packages = {}
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+            return None, {}, last_line
+        module_us, packages = parse_importtime(result.stderr, module)
+        samples.append(module_us)
+    return statistics.median(samples), packages, None
+
+
+# --- Main Execution Block ---
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time of each Mage block.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per block (median is reported).")
+    parser.add_argument("--history", help="JSON file to compare against and append this run's results to.")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest direct imports to list per block.")
+    args = parser.parse_args()
+
+    previous = {}
+    history = []
+    if args.history and os.path.exists(args.history):
+        with open(args.history, encoding="utf-8") as f:
+            history = json.load(f)
+        if history:
+            previous = history[-1]["results"]
+
+    results = {}
+    print(f"{'block':45} {'median ms':>10} {'change':>9}  heaviest imports")
+    for label, cwd, module in discover_targets():
+        median_us, packages, error = measure(cwd, module, args.repeat)
+        if error:
+            print(f"{label:45} {'failed':>10} {'':>9}  {error}")
+            continue
+
+        results[label] = median_us
+        change = ""
+        if previous.get(label):
+            change = f"{(median_us - previous[label]) / previous[label]:+.0%}"
+        heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        heaviest_text = ", ".join(f"{name} {us / 1000:.0f}ms" for name, us in heaviest)
+        print(f"{label:45} {median_us / 1000:>10.1f} {change:>9}  {heaviest_text}")
+
+    if args.history:
+        history.append({
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "results": results,
+        })
+        with open(args.history, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2)
+        print(f"\nResults appended to {args.history}")
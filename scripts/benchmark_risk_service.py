@@ -0,0 +1,194 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from risk_service import RiskServer
+
+# risk_service puts the Mage project on the path, so utils/ is importable here.
+from utils.cities import build_cities_table
+from utils.extract import CITIES
+from utils.risk_snapshot import (
+    RiskIndex,
+    build_risk_snapshot,
+    load_risk_snapshot,
+    save_risk_snapshot,
+    snapshot_to_frame,
+)
+
+# --- Risk Service Benchmark ---
+# Starts the risk service in this process and measures request latency and
+# throughput for a mix of point and range queries from several keep-alive
+# clients. It can also rewrite the snapshot while the load runs to show that
+# reloads do not fail or stall requests. Results can be appended to a JSON history.
+
+
+def synthetic_weather(cities, days: int, seed: int = 0):
+    """
+    A 'weather_forecasts' DataFrame with random values for every row of the given
+    'cities' table, for benchmarking without a pipeline run.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    times = pd.date_range("2025-06-01", periods=days * 8, freq="3h")
+    n = len(cities) * len(times)
+    return pd.DataFrame({
+        "city_id": np.repeat(cities["city_id"].to_numpy(), len(times)),
+        "forecast_time": np.tile(times, len(cities)),
+        "temperature": rng.normal(22, 4, n).round(2),
+        "rainfall_mm": np.where(rng.random(n) < 0.3, rng.gamma(1.5, 1.5, n), 0).round(2),
+        "wind_speed_ms": rng.gamma(3, 1.5, n).round(2),
+    })
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def build_paths(index: RiskIndex, count: int, range_share: float, seed: int = 0) -> list:
+    """Random request paths: point lookups, plus one-day range queries for range_share of them."""
+    rng = random.Random(seed)
+    span = index.slot_count * index.slot_seconds
+    paths = []
+    for _ in range(count):
+        city = rng.choice(index.cities)
+        when = index.start + rng.randrange(span)
+        stamp = datetime.fromtimestamp(when, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        if rng.random() < range_share:
+            end = datetime.fromtimestamp(when + 86400, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            paths.append("/risk/range?" + urlencode({"city": city, "start": stamp, "end": end}))
+        else:
+            paths.append("/risk?" + urlencode({"city": city, "time": stamp}))
+    return paths
+
+
+def run_client(port: int, paths: list, latencies: list, errors: list) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    for path in paths:
+        started = time.perf_counter()
+        conn.request("GET", path)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+        if response.status not in (200, 404):
+            errors.append(response.status)
+    conn.close()
+
+
+def rewrite_snapshot(path: str, df, cities, every: float, stop: threading.Event, counter: list) -> None:
+    """Re-saves the snapshot with fresh values every `every` seconds to force reloads."""
+    while not stop.wait(every):
+        df["rainfall_mm"] = df["rainfall_mm"].sample(frac=1).to_numpy()
+        save_risk_snapshot(build_risk_snapshot(df, cities), path)
+        counter[0] += 1
+
+
+# --- Main Execution Block ---
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark latency and throughput of the risk service.")
+    parser.add_argument("--snapshot", help="Existing snapshot to serve. A synthetic one is built if omitted.")
+    parser.add_argument("--cities", type=int, default=len(CITIES), help="Cities in the synthetic snapshot.")
+    parser.add_argument("--days", type=int, default=5, help="Forecast days in the synthetic snapshot.")
+    parser.add_argument("--requests", type=int, default=20000, help="Total HTTP requests.")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent keep-alive clients.")
+    parser.add_argument("--range-share", type=float, default=0.2, help="Share of requests that are range queries.")
+    parser.add_argument("--reload-every", type=float, default=0,
+                        help="Rewrite the snapshot (a copy of --snapshot, if given) every N seconds during the run.")
+    parser.add_argument("--history", help="JSON file to append this run's results to.")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="risk-bench-")
+    snapshot_path = args.snapshot
+    df = cities = None
+    if not snapshot_path:
+        extra = {f"Location {i}": {"lat": 0.0, "lon": 0.0} for i in range(max(0, args.cities - len(CITIES)))}
+        cities = build_cities_table(extra).head(args.cities)
+        df = synthetic_weather(cities, args.days)
+        snapshot_path = os.path.join(workdir, "risk_snapshot.npz")
+        save_risk_snapshot(build_risk_snapshot(df, cities), snapshot_path)
+    elif args.reload_every:
+        # Rewrite a copy of the given snapshot, so the file passed in is left as it was.
+        import pandas as pd
+
+        snapshot = load_risk_snapshot(snapshot_path)
+        df = snapshot_to_frame(snapshot)
+        cities = pd.DataFrame({"city_id": snapshot["city_ids"], "city_name": snapshot["cities"]})
+        snapshot_path = os.path.join(workdir, "risk_snapshot.npz")
+        save_risk_snapshot(build_risk_snapshot(df, cities), snapshot_path)
+
+    # In-process lookups, to separate the index cost from HTTP overhead.
+    index = RiskIndex(load_risk_snapshot(snapshot_path))
+    lookups = [(random.choice(index.cities), index.start + random.randrange(index.slot_count * index.slot_seconds))
+               for _ in range(100000)]
+    started = time.perf_counter()
+    for city, when in lookups:
+        index.point(city, when)
+    lookup_us = (time.perf_counter() - started) / len(lookups) * 1e6
+
+    server = RiskServer(("127.0.0.1", 0), snapshot_path, reload_interval=0.2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    paths = build_paths(index, args.requests, args.range_share)
+    latencies, errors, reloads = [], [], [0]
+    stop = threading.Event()
+    if args.reload_every:
+        threading.Thread(target=rewrite_snapshot, args=(snapshot_path, df, cities, args.reload_every, stop, reloads),
+                         daemon=True).start()
+
+    clients = [
+        threading.Thread(target=run_client, args=(port, paths[i::args.clients], latencies, errors))
+        for i in range(args.clients)
+    ]
+    started = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    server.shutdown()
+    server.server_close()
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    results = {
+        "cities": len(index.cities),
+        "slots": index.slot_count,
+        "requests": len(latencies_ms),
+        "clients": args.clients,
+        "errors": len(errors),
+        "snapshot_rewrites": reloads[0],
+        "throughput_rps": round(len(latencies_ms) / elapsed, 1),
+        "latency_p50_ms": round(statistics.median(latencies_ms), 3),
+        "latency_p95_ms": round(percentile(latencies_ms, 0.95), 3),
+        "latency_p99_ms": round(percentile(latencies_ms, 0.99), 3),
+        "latency_max_ms": round(latencies_ms[-1], 3),
+        "in_process_lookup_us": round(lookup_us, 2),
+    }
+    for name, value in results.items():
+        print(f"{name:22} {value}")
+
+    if args.history:
+        history = []
+        if os.path.exists(args.history):
+            with open(args.history, encoding="utf-8") as f:
+                history = json.load(f)
+        history.append({
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "results": results,
+        })
+        with open(args.history, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2)
+        print(f"\nResults appended to {args.history}")
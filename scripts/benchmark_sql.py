@@ -0,0 +1,249 @@
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+# The Mage project keeps its shared helpers in 'utils/', so add it to the path.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Kenya-Weather-Aware-Dashboard"))
+
+from utils.synthetic import TABLES, generate_star_schema
+from utils.warehouse import ANALYSIS_FILES
+
+# --- SQL Analysis Benchmark ---
+# Loads a scaled synthetic dataset into DuckDB or PostgreSQL, runs every dashboard
+# analysis and its rewritten variants several times, and captures the query plan
+# with EXPLAIN ANALYZE (plus BUFFERS on PostgreSQL). Timings and plans are appended
+# to a JSON history, and each query is compared with the last run on the same engine.
+#
+# Variants live in 'sql_variants/' and are named '<original name>__<variant>.sql'.
+# Before a variant is timed, its rows are checked against the original's rows.
+
+VARIANTS_DIR = os.path.join(REPO_ROOT, "sql_variants")
+DEFAULT_DATA_DIR = os.path.join(REPO_ROOT, "synthetic_data")
+
+
+def read_query(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read().strip().rstrip(";")
+
+
+def discover_queries(sql_dir: str, variants_dir: str) -> list:
+    """(name, path, original name or None) for every analysis and its variants."""
+    queries = []
+    for file_name in ANALYSIS_FILES:
+        queries.append((file_name, os.path.join(sql_dir, file_name), None))
+        stem = os.path.splitext(file_name)[0]
+        for path in sorted(glob.glob(os.path.join(variants_dir, f"{stem}__*.sql"))):
+            queries.append((os.path.basename(path), path, file_name))
+    return queries
+
+
+class DuckDBEngine:
+    name = "duckdb"
+
+    def __init__(self, database: str):
+        import duckdb
+        self.con = duckdb.connect(database)
+
+    def load(self, data_dir: str) -> None:
+        for table in TABLES:
+            parts = os.path.join(data_dir, table, "*.parquet")
+            self.con.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM read_parquet('{parts}')")
+
+    def execute(self, sql: str) -> None:
+        self.con.execute(sql)
+
+    def fetch(self, query: str):
+        return self.con.execute(query).df()
+
+    def run(self, query: str) -> int:
+        return len(self.con.execute(query).fetchall())
+
+    def explain(self, query: str) -> str:
+        return "\n".join(row[1] for row in self.con.execute(f"EXPLAIN ANALYZE {query}").fetchall())
+
+    def close(self) -> None:
+        self.con.close()
+
+
+class PostgresEngine:
+    name = "postgres"
+
+    def __init__(self, dsn: str):
+        import psycopg2
+        self.dsn = dsn
+        self.conn = psycopg2.connect(dsn)
+        self.conn.autocommit = True
+
+    def load(self, data_dir: str) -> None:
+        from utils.synthetic import copy_chunk_to_postgres, create_postgres_tables
+        import pandas as pd
+
+        create_postgres_tables(self.dsn)
+        for table in TABLES:
+            for part in sorted(glob.glob(os.path.join(data_dir, table, "*.parquet"))):
+                copy_chunk_to_postgres(pd.read_parquet(part), self.dsn, table)
+
+    def execute(self, sql: str) -> None:
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql)
+
+    def fetch(self, query: str):
+        import pandas as pd
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(query)
+            columns = [column.name for column in cursor.description]
+            return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+    def run(self, query: str) -> int:
+        with self.conn.cursor() as cursor:
+            cursor.execute(query)
+            return len(cursor.fetchall())
+
+    def explain(self, query: str) -> str:
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}")
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def normalize(df):
+    """Rows in a canonical order with canonical types, so two result sets can be compared."""
+    import pandas as pd
+
+    df = df.copy()
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_bool_dtype(values) or (pd.api.types.is_object_dtype(values) and values.map(type).eq(bool).all()):
+            df[column] = values.astype(bool)
+            continue
+        numeric = pd.to_numeric(values, errors="coerce")
+        if numeric.notna().sum() == values.notna().sum() and not pd.api.types.is_datetime64_any_dtype(values):
+            # REAL columns and reordered sums differ in the last digits, so compare rounded.
+            df[column] = numeric.astype(float).round(4)
+        else:
+            df[column] = values.astype(str)
+    df.columns = range(len(df.columns))
+    return df.sort_values(list(df.columns), ignore_index=True)
+
+
+def same_rows(original, variant) -> bool:
+    if original.shape != variant.shape:
+        return False
+    return normalize(original).equals(normalize(variant))
+
+
+def time_query(engine, query: str, repeat: int) -> dict:
+    engine.run(query)  # Warm-up, so the first timed run is not paying for cold caches.
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = engine.run(query)
+        timings.append(time.perf_counter() - start)
+    return {
+        "rows": rows,
+        "median_s": round(statistics.median(timings), 4),
+        "min_s": round(min(timings), 4),
+        "max_s": round(max(timings), 4),
+        "runs": repeat,
+    }
+
+
+# --- Main Execution Block ---
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard SQL analyses and their variants.")
+    parser.add_argument("--engine", choices=["duckdb", "postgres"], default="duckdb")
+    parser.add_argument("--scale-factor", type=float, help="Generate fresh synthetic data at this scale first.")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Parquet folder from generate_synthetic_data.py.")
+    parser.add_argument("--skip-load", action="store_true", help="Reuse the tables already in the database.")
+    parser.add_argument("--database", default=os.path.join(REPO_ROOT, "benchmark.duckdb"), help="DuckDB database file.")
+    parser.add_argument("--dsn", help="PostgreSQL connection string. Defaults to the DB_* settings in .env.")
+    parser.add_argument("--setup-sql", help="SQL file run after loading, e.g. to create the indexes being tested.")
+    parser.add_argument("--sql-dir", default=REPO_ROOT, help="Folder containing the original .sql analyses.")
+    parser.add_argument("--variants-dir", default=VARIANTS_DIR)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query (median is reported).")
+    parser.add_argument("--label", default="", help="Note stored with this run, e.g. 'orders_date_index'.")
+    parser.add_argument("--history", default=os.path.join(REPO_ROOT, "sql_benchmark_history.json"))
+    parser.add_argument("--regression-threshold", type=float, default=0.2, help="Slowdown flagged as a regression.")
+    parser.add_argument("--regression-min-seconds", type=float, default=0.005,
+                        help="Smallest absolute slowdown flagged as a regression.")
+    args = parser.parse_args()
+
+    if args.engine == "duckdb":
+        engine = DuckDBEngine(args.database)
+    else:
+        from generate_synthetic_data import postgres_dsn_from_env
+        engine = PostgresEngine(args.dsn or postgres_dsn_from_env())
+
+    if args.scale_factor:
+        generate_star_schema(args.scale_factor, "parquet", args.data_dir)
+    if not args.skip_load:
+        print(f"Loading {args.data_dir} into {engine.name}...")
+        engine.load(args.data_dir)
+        if engine.name == "postgres":
+            engine.execute("ANALYZE")
+    if args.setup_sql:
+        engine.execute(read_query(args.setup_sql))
+
+    history = []
+    if os.path.exists(args.history):
+        with open(args.history, encoding="utf-8") as f:
+            history = json.load(f)
+    table_rows = {table: int(engine.fetch(f"SELECT COUNT(*) AS n FROM {table}").iloc[0, 0]) for table in TABLES}
+    print(", ".join(f"{table}: {rows:,}" for table, rows in table_rows.items()))
+    previous = next((run["results"] for run in reversed(history) if run["engine"] == engine.name), {})
+
+    results = {}
+    originals = {}
+    mismatches = []
+    print(f"\n{'query':55} {'rows':>10} {'median s':>10} {'change':>9}")
+    for name, path, original_name in discover_queries(args.sql_dir, args.variants_dir):
+        query = read_query(path)
+        if original_name is None:
+            originals[name] = engine.fetch(query)
+        elif original_name in originals and not same_rows(originals[original_name], engine.fetch(query)):
+            mismatches.append(name)
+            print(f"{name:55} {'MISMATCH':>10}  rows differ from '{original_name}', not timed")
+            continue
+
+        result = time_query(engine, query, args.repeat)
+        result["plan"] = engine.explain(query)
+        if original_name:
+            result["variant_of"] = original_name
+        results[name] = result
+
+        change = ""
+        if name in previous and previous[name]["median_s"]:
+            ratio = (result["median_s"] - previous[name]["median_s"]) / previous[name]["median_s"]
+            # Sub-millisecond queries jitter by more than the threshold, so also require a real slowdown.
+            slower_by = result["median_s"] - previous[name]["median_s"]
+            regressed = ratio > args.regression_threshold and slower_by >= args.regression_min_seconds
+            change = f"{ratio:+.0%}" + (" REGRESSION" if regressed else "")
+        print(f"{name:55} {result['rows']:>10} {result['median_s']:>10.4f} {change:>9}")
+
+    engine.close()
+
+    history.append({
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "engine": engine.name,
+        "label": args.label,
+        "table_rows": table_rows,
+        "results": results,
+    })
+    with open(args.history, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    print(f"\nTimings and plans appended to {args.history}")
+
+    if mismatches:
+        print(f"Variants returning different rows: {', '.join(mismatches)}")
+        sys.exit(1)
@@ -1,33 +1,40 @@
 import os
-import pandas as pd
 import random
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
+from functools import lru_cache
 
 # Import the data fetching functions from your first script
-from data_extraction import fetch_weather_data, fetch_product_data, fetch_customer_data, CITIES
+from data_extraction import fetch_weather_data, fetch_product_data, fetch_customer_data, CITIES, load_env
 
 # --- Database Connection Setup ---
-load_dotenv()
 
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
-DB_NAME = os.getenv("DB_NAME")
+@lru_cache(maxsize=None)
+def get_engine():
+    """
+    Creates the SQLAlchemy engine the first time it is needed.
+    The engine is the entry point to the database for SQLAlchemy.
+    """
+    from sqlalchemy import create_engine
 
-# Create the database connection URL and the SQLAlchemy engine
-# The engine is the entry point to the database for SQLAlchemy.
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
+    load_env()
+    DB_USER = os.getenv("DB_USER")
+    DB_PASSWORD = os.getenv("DB_PASSWORD")
+    DB_HOST = os.getenv("DB_HOST")
+    DB_PORT = os.getenv("DB_PORT")
+    DB_NAME = os.getenv("DB_NAME")
 
-print("Database engine created successfully.")
+    # Create the database connection URL and the SQLAlchemy engine
+    DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    engine = create_engine(DATABASE_URL)
+    print("Database engine created successfully.")
+    return engine
 
 # --- Data Transformation Functions ---
 
 def transform_weather_data(weather_data_raw):
     """Cleans and transforms raw weather data to match the database schema."""
+    import pandas as pd
+
     if not weather_data_raw:
         return pd.DataFrame()
 
@@ -52,6 +59,8 @@ def transform_weather_data(weather_data_raw):
 
 def transform_product_data(product_data_raw):
     """Cleans and transforms raw product data."""
+    import pandas as pd
+
     if not product_data_raw:
         return pd.DataFrame()
         
@@ -66,6 +75,8 @@ def transform_product_data(product_data_raw):
 
 def transform_customer_data(customer_data_raw):
     """Cleans and transforms raw customer data."""
+    import pandas as pd
+
     if not customer_data_raw:
         return pd.DataFrame()
 
@@ -83,6 +94,8 @@ def transform_customer_data(customer_data_raw):
 
 def generate_mock_orders(customers_df, products_df, num_orders=200):
     """Generates a DataFrame of mock orders."""
+    import pandas as pd
+
     if customers_df.empty or products_df.empty:
         return pd.DataFrame()
 
@@ -109,6 +122,7 @@ def generate_mock_orders(customers_df, products_df, num_orders=200):
 if __name__ == "__main__":
     # 1. EXTRACT raw data using functions from the other script
     print("--- Starting Data Extraction ---")
+    load_env()
     api_key = os.getenv("OPENWEATHER_API_KEY")
     weather_raw = fetch_weather_data(api_key, CITIES)
     products_raw = fetch_product_data()
@@ -124,6 +138,7 @@ if __name__ == "__main__":
     # 3. LOAD the clean DataFrames into the PostgreSQL database
     print("\n--- Starting Data Loading ---")
     try:
+        engine = get_engine()
         # Use .to_sql() to write each DataFrame to a new table
         # if_exists='replace' will drop the table if it already exists and create a new one.
         # This is useful for development and running the script multiple times.
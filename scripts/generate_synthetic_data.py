@@ -0,0 +1,64 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+# The Mage project keeps its shared helpers in 'utils/', so add it to the path.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Kenya-Weather-Aware-Dashboard"))
+
+from utils.synthetic import DEFAULT_CHUNK_ROWS, generate_star_schema
+
+
+def postgres_dsn_from_env() -> str:
+    """Builds a connection string from the DB_* variables in the .env file."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return (
+        f"host={os.getenv('DB_HOST', 'localhost')} port={os.getenv('DB_PORT', '5432')} "
+        f"dbname={os.getenv('DB_NAME')} user={os.getenv('DB_USER')} password={os.getenv('DB_PASSWORD')}"
+    )
+
+
+# --- Main Execution Block ---
+# Writes a synthetic customers/products/orders/weather_forecasts star schema for
+# load-testing the SQL analyses and exporters. Scale factor 1 = 1M orders, so
+# --scale-factor 10 and 100 give the 10M and 100M order datasets.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic star schema at a given scale factor.")
+    parser.add_argument("--scale-factor", type=float, default=1.0, help="1 = 1M orders, 100k customers, 2k products.")
+    parser.add_argument("--sink", choices=["parquet", "postgres"], default="parquet")
+    parser.add_argument(
+        "--out-dir",
+        default=os.path.join(REPO_ROOT, "synthetic_data"),
+        help="Output folder for the Parquet sink (one sub-folder per table).",
+    )
+    parser.add_argument("--dsn", help="PostgreSQL connection string. Defaults to the DB_* settings in .env.")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows per chunk and part file.")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU core).")
+    parser.add_argument("--seed", type=int, default=42, help="Same seed and scale factor give the same data.")
+    parser.add_argument("--end-date", help="Last day of the order window, YYYY-MM-DD (default: today).")
+    args = parser.parse_args()
+
+    target = args.out_dir if args.sink == "parquet" else (args.dsn or postgres_dsn_from_env())
+    end_date = datetime.strptime(args.end_date, "%Y-%m-%d") if args.end_date else None
+
+    start = time.perf_counter()
+    rows = generate_star_schema(
+        args.scale_factor,
+        args.sink,
+        target,
+        chunk_rows=args.chunk_rows,
+        max_workers=args.workers,
+        seed=args.seed,
+        end_date=end_date,
+    )
+    elapsed = time.perf_counter() - start
+
+    for table, count in rows.items():
+        print(f"  {table:18} {count:>14,} rows")
+    total = sum(rows.values())
+    print(f"Generated {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s).")
@@ -0,0 +1,152 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# The Mage project keeps its shared helpers in 'utils/', so add it to the path.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAGE_PROJECT = os.path.join(REPO_ROOT, "Kenya-Weather-Aware-Dashboard")
+sys.path.insert(0, MAGE_PROJECT)
+
+from utils.risk_snapshot import DEFAULT_SNAPSHOT_FILE, RiskIndex, load_risk_snapshot
+
+# --- Read-Only Delivery Risk Service ---
+# Serves per-city, per-slot rain and wind risk from the snapshot written by the
+# weather exporters. Endpoints (times are ISO 8601, UTC unless an offset is given):
+#   GET /health
+#   GET /risk?city=Nairobi&time=2025-06-01T09:30
+#   GET /risk/range?start=2025-06-01&end=2025-06-02[&city=Nairobi]
+# A background thread watches the snapshot file and swaps in a new index when it
+# changes. Requests read the index reference once, so each one sees one snapshot.
+
+
+def parse_time(value: str) -> int:
+    """Returns an ISO 8601 timestamp as epoch seconds, treating naive times as UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+class RiskServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, snapshot_path: str, reload_interval: float = 2.0):
+        super().__init__(address, RiskRequestHandler)
+        self.snapshot_path = snapshot_path
+        self.reload_interval = reload_interval
+        self.snapshot_mtime = None
+        self.loaded_at = None
+        self.index = None
+        self.reload()
+        self._stop_watching = threading.Event()
+        self._watcher = threading.Thread(target=self._watch_snapshot, daemon=True)
+        self._watcher.start()
+
+    def reload(self) -> bool:
+        """Loads the snapshot if it changed since the last load. Returns True when swapped."""
+        try:
+            mtime = os.stat(self.snapshot_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self.snapshot_mtime:
+            return False
+        index = RiskIndex(load_risk_snapshot(self.snapshot_path))
+        # A single attribute assignment, so in-flight requests keep the old index.
+        self.index = index
+        self.snapshot_mtime = mtime
+        self.loaded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        print(f"Loaded risk snapshot: {len(index.cities)} cities x {index.slot_count} slots.")
+        return True
+
+    def _watch_snapshot(self) -> None:
+        while not self._stop_watching.wait(self.reload_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"Error reloading risk snapshot, keeping the previous one: {e}")
+
+    def server_close(self) -> None:
+        self._stop_watching.set()
+        super().server_close()
+
+
+class RiskRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so dispatch clients can reuse one connection for many lookups.
+    # Nagle's algorithm would hold back small responses on such connections for ~40 ms.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        index = self.server.index
+
+        if url.path == "/health":
+            return self._send_json(200, {
+                "status": "ok" if index else "no snapshot",
+                "cities": index.cities if index else [],
+                "slots": index.slot_count if index else 0,
+                "loaded_at": self.server.loaded_at,
+            })
+        if index is None:
+            return self._send_json(503, {"error": "No risk snapshot has been loaded yet."})
+
+        city = params.get("city")
+        if city is not None and city not in index.city_index:
+            return self._send_json(404, {"error": f"Unknown city '{city}'."})
+        try:
+            if url.path == "/risk":
+                if not city or "time" not in params:
+                    return self._send_json(400, {"error": "'city' and 'time' are required."})
+                record = index.point(city, parse_time(params["time"]))
+                if record is None:
+                    return self._send_json(404, {"error": "No forecast for that city and time."})
+                return self._send_json(200, record)
+            if url.path == "/risk/range":
+                if "start" not in params or "end" not in params:
+                    return self._send_json(400, {"error": "'start' and 'end' are required."})
+                records = index.range(parse_time(params["start"]), parse_time(params["end"]), city)
+                return self._send_json(200, {"count": len(records), "slots": records})
+        except ValueError as e:
+            return self._send_json(400, {"error": f"Invalid time: {e}"})
+        return self._send_json(404, {"error": f"Unknown path '{url.path}'."})
+
+
+# --- Main Execution Block ---
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve delivery risk flags from the latest weather snapshot.")
+    parser.add_argument(
+        "--snapshot",
+        default=os.path.join(MAGE_PROJECT, "state", DEFAULT_SNAPSHOT_FILE),
+        help="Path to the .npz snapshot written by the weather exporters.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--reload-interval", type=float, default=2.0, help="Seconds between snapshot checks.")
+    args = parser.parse_args()
+
+    server = RiskServer((args.host, args.port), args.snapshot, args.reload_interval)
+    print(f"Risk service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
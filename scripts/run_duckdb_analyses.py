@@ -0,0 +1,32 @@
+import argparse
+import os
+import sys
+import time
+
+# The Mage project keeps its shared helpers in 'utils/', so add it to the path.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Kenya-Weather-Aware-Dashboard"))
+
+from utils.warehouse import ANALYSIS_FILES, DEFAULT_DUCKDB_DATABASE, run_analyses
+
+# --- Main Execution Block ---
+# Runs the four dashboard analyses against the embedded DuckDB database
+# written by the 'export_to_duckdb' block, instead of a PostgreSQL server.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the dashboard SQL analyses against DuckDB.")
+    parser.add_argument(
+        "--database",
+        default=os.path.join(REPO_ROOT, "Kenya-Weather-Aware-Dashboard", DEFAULT_DUCKDB_DATABASE),
+        help="Path to the DuckDB database file.",
+    )
+    parser.add_argument("--sql-dir", default=REPO_ROOT, help="Folder containing the .sql analyses.")
+    args = parser.parse_args()
+
+    for file_name in ANALYSIS_FILES:
+        start = time.perf_counter()
+        result = run_analyses(args.database, args.sql_dir, files=[file_name])[file_name]
+        elapsed = time.perf_counter() - start
+
+        print(f"\n--- {file_name} ({len(result)} rows in {elapsed:.3f}s) ---")
+        print(result.head())
@@ -0,0 +1,5 @@
+-- Same result as 'On time Delivery Rates.sql', counting with a FILTER clause
+-- instead of summing a CASE expression over every order.
+SELECT
+    CAST(COUNT(*) FILTER (WHERE delivery_status = 'On Time') AS REAL) * 100 / COUNT(order_id) AS on_time_delivery_percentage
+FROM orders;
@@ -0,0 +1,36 @@
+-- Same result as 'Risk Flag Analysis.sql', but the join on the order date is a
+-- range on the raw order_date column instead of DATE(o.order_date) = ..., so an
+-- index on orders(order_date) can be used and the cast is not repeated per row.
+-- Without such an index (e.g. on DuckDB) the original's equality hash join is faster.
+WITH daily_weather_summary AS (
+    SELECT
+        city_id,
+        DATE(forecast_time) AS forecast_day,
+        SUM(rainfall_mm) AS total_daily_rainfall,
+        MAX(wind_speed_ms) AS max_daily_wind_speed,
+        SUM(CASE WHEN rainfall_mm > 0 THEN 1 ELSE 0 END) AS rainy_periods
+    FROM weather_forecasts
+    GROUP BY city_id, forecast_day
+)
+SELECT
+    dws.forecast_day AS order_day,
+    ci.city_name AS city,
+    dws.total_daily_rainfall,
+    dws.max_daily_wind_speed,
+    CASE
+        WHEN dws.total_daily_rainfall >= 5 OR dws.rainy_periods >= 3 THEN TRUE
+        ELSE FALSE
+    END AS rain_risk_flag,
+    CASE
+        WHEN dws.max_daily_wind_speed >= 10 THEN TRUE
+        ELSE FALSE
+    END AS wind_risk_flag,
+    o.delivery_status
+FROM orders o
+JOIN customers c ON o.customer_id = c.customer_id
+JOIN daily_weather_summary dws
+    ON c.city_id = dws.city_id
+    AND o.order_date >= dws.forecast_day
+    AND o.order_date < dws.forecast_day + INTERVAL '1 day'
+JOIN cities ci ON c.city_id = ci.city_id
+ORDER BY order_day, ci.city_name;
@@ -0,0 +1,19 @@
+-- Same result as 'Total Daily Orders by City.sql', but orders are first rolled up
+-- per customer and day, so the joins to customers and cities handle far fewer rows.
+WITH customer_daily_orders AS (
+    SELECT
+        customer_id,
+        DATE(order_date) AS order_day,
+        COUNT(order_id) AS orders
+    FROM orders
+    GROUP BY customer_id, DATE(order_date)
+)
+SELECT
+    ci.city_name AS city,
+    cdo.order_day,
+    SUM(cdo.orders) AS total_orders
+FROM customer_daily_orders cdo
+JOIN customers c ON cdo.customer_id = c.customer_id
+JOIN cities ci ON c.city_id = ci.city_id
+GROUP BY ci.city_name, cdo.order_day
+ORDER BY cdo.order_day, ci.city_name;